@@ -0,0 +1,94 @@
+"""Load/save benchmark of the intermediate catalog formats.
+
+Compares the former ``pandas.CSVDataset`` hand-off with the ``_parquet`` dataset template
+from ``conf/base/catalog.yml`` on the preprocessed student performance factors data,
+replicated 10x to 1000x.
+
+Run it from the project root:
+    python benchmarks/catalog_io_benchmark.py --scales 10 100 1000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import yaml
+from kedro_datasets.pandas import CSVDataset, ParquetDataset
+
+PROJECT_PATH = Path(__file__).resolve().parents[1]
+RAW_DATA = PROJECT_PATH / "data" / "01_raw" / "student_performance_factors.csv"
+CATALOG = PROJECT_PATH / "conf" / "base" / "catalog.yml"
+
+
+def _parquet_dataset(filepath: Path) -> ParquetDataset:
+    """Creates a ParquetDataset configured exactly like the catalog template."""
+    config = yaml.safe_load(CATALOG.read_text())["_parquet"]
+    return ParquetDataset(
+        filepath=str(filepath),
+        load_args=config.get("load_args"),
+        save_args=config.get("save_args"),
+    )
+
+
+def _best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark(scales: list[int], repeat: int) -> pd.DataFrame:
+    """Times save and load of the preprocessed data for every scale and format.
+
+    Args:
+        scales: Replication factors of the raw file.
+        repeat: Number of repetitions, the best one is reported.
+
+    Returns:
+        One row per scale and format with timings, throughput and file size.
+    """
+    raw = pd.read_csv(RAW_DATA)
+    raw = raw.dropna(subset=["Parental_Education_Level", "Teacher_Quality", "Distance_from_Home"])
+    categorical_columns = raw.select_dtypes(include=["object"]).columns
+    raw[categorical_columns] = raw[categorical_columns].astype("category")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in scales:
+            data = pd.concat([raw] * scale, ignore_index=True)
+            datasets = {
+                "csv": CSVDataset(filepath=str(Path(tmp_dir) / f"data_{scale}.csv")),
+                "parquet": _parquet_dataset(Path(tmp_dir) / f"data_{scale}.parquet"),
+            }
+            for name, dataset in datasets.items():
+                save_s = _best_of(lambda: dataset.save(data), repeat)
+                load_s = _best_of(dataset.load, repeat)
+                results.append({
+                    "scale": scale,
+                    "rows": len(data),
+                    "format": name,
+                    "save_s": round(save_s, 4),
+                    "load_s": round(load_s, 4),
+                    "load_rows_per_s": int(len(data) / load_s),
+                    "file_mb": round(Path(dataset._filepath).stat().st_size / 1024**2, 2),
+                })
+            del data
+
+    return pd.DataFrame(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = benchmark(args.scales, args.repeat)
+    print(results.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
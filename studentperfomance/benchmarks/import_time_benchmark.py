@@ -0,0 +1,87 @@
+"""Measures the startup time of ``kedro run`` for every pipeline.
+
+In a fresh Python process per pipeline and repetition it times the steps before
+the first node runs: bootstrapping the project (settings and hooks), building
+the pipeline registry and creating the data catalog. It also lists which heavy
+libraries were imported by then, which should only happen when a node needs them.
+
+Run it from the project root:
+    python benchmarks/import_time_benchmark.py --repeat 5
+    python -X importtime -m studentperfomance --help 2> importtime.log  # per-module details
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("autogluon", "torch", "sklearn", "seaborn", "matplotlib", "kedro_viz")
+
+
+def measure(pipeline_name: str) -> dict:
+    """Times the startup steps for a pipeline in this process."""
+    start = time.perf_counter()
+    from kedro.framework.project import pipelines
+    from kedro.framework.session import KedroSession
+    from kedro.framework.startup import bootstrap_project
+
+    bootstrap_project(PROJECT_PATH)
+    bootstrapped = time.perf_counter()
+    pipelines[pipeline_name]
+    registered = time.perf_counter()
+    with KedroSession.create(project_path=PROJECT_PATH) as session:
+        session.load_context().catalog
+    catalog_created = time.perf_counter()
+
+    return {
+        "pipeline": pipeline_name,
+        "bootstrap_s": bootstrapped - start,
+        "pipelines_s": registered - bootstrapped,
+        "catalog_s": catalog_created - registered,
+        "total_s": catalog_created - start,
+        "heavy_imports": ",".join(module for module in HEAVY_MODULES if module in sys.modules) or "-",
+    }
+
+
+def _pipeline_names() -> list[str]:
+    output = subprocess.run(
+        [sys.executable, "-c", "from kedro.framework.project import pipelines; from kedro.framework.startup import bootstrap_project; "
+         f"bootstrap_project({str(PROJECT_PATH)!r}); print(','.join(pipelines))"],
+        cwd=PROJECT_PATH, check=True, capture_output=True, text=True,
+    ).stdout
+    return output.strip().splitlines()[-1].split(",")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pipelines", nargs="+", help="Pipelines to measure, all registered ones by default.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per pipeline, the median is reported.")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure)))
+        return
+
+    import pandas as pd
+
+    results = []
+    for pipeline_name in args.pipelines or _pipeline_names():
+        runs = []
+        for _ in range(args.repeat):
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", pipeline_name],
+                cwd=PROJECT_PATH, check=True, capture_output=True, text=True,
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+        result = {key: round(statistics.median(run[key] for run in runs), 3) for key in ("bootstrap_s", "pipelines_s", "catalog_s", "total_s")}
+        results.append({"pipeline": pipeline_name, **result, "heavy_imports": runs[-1]["heavy_imports"]})
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Compares the pickled predictors with their inference artifacts.
+
+Every predictor is loaded through the data catalog in a fresh Python process, so
+the load time includes the cold start of the AutoGluon imports. It reports the
+load time, the memory the loaded predictor takes, the per-row latency of single
+student predictions and the throughput of a prediction of the whole test data.
+
+Run it from the project root after the data_science_export pipeline:
+    python benchmarks/inference_artifact_benchmark.py --rows 200
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).resolve().parents[1]
+DATASETS = {
+    "tabular": ("autogluon_tabular_model", "autogluon_tabular_inference_artifact"),
+    "tabular_nn": ("autogluon_tabular_nn_model", "autogluon_tabular_nn_inference_artifact"),
+}
+
+
+def measure(dataset_name: str, rows: int, label_column: str) -> dict:
+    """Loads a predictor in this process and measures it."""
+    import numpy as np
+    import pandas as pd
+    import psutil
+    from kedro.framework.session import KedroSession
+    from kedro.framework.startup import bootstrap_project
+
+    bootstrap_project(PROJECT_PATH)
+    with KedroSession.create(project_path=PROJECT_PATH) as session:
+        catalog = session.load_context().catalog
+        test_data = catalog.load("student_performance_factors_test_data@pandas").drop(columns=[label_column])
+
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        start = time.perf_counter()
+        predictor = catalog.load(dataset_name)
+        load_s = time.perf_counter() - start
+        # The first prediction loads the models that were not kept in memory, and the pickled
+        # predictors themselves, which the model store only loads on first use
+        start = time.perf_counter()
+        predictor.predict(test_data.head(1))
+        first_prediction_s = time.perf_counter() - start
+        memory_mb = (process.memory_info().rss - rss_before) / 1024**2
+
+    latencies = []
+    for i in range(rows):
+        row = test_data.iloc[[i % len(test_data)]]
+        start = time.perf_counter()
+        predictor.predict(row)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.asarray(latencies) * 1000
+
+    start = time.perf_counter()
+    predictor.predict(test_data)
+    batch_s = time.perf_counter() - start
+
+    return {
+        "dataset": dataset_name,
+        "model": predictor.model_best,
+        "load_s": round(load_s, 3),
+        "first_prediction_s": round(first_prediction_s, 3),
+        "memory_mb": round(memory_mb, 1),
+        "row_p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "row_p99_ms": round(float(np.percentile(latencies, 99)), 3),
+        "batch_rows_per_s": round(len(test_data) / batch_s, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--predictors", nargs="+", choices=list(DATASETS), default=list(DATASETS))
+    parser.add_argument("--rows", type=int, default=200, help="Single-row predictions per predictor.")
+    parser.add_argument("--label-column", default="Exam_Score")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.rows, args.label_column)))
+        return
+
+    import pandas as pd
+
+    results = []
+    for predictor in args.predictors:
+        for dataset_name in DATASETS[predictor]:
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", dataset_name, "--rows", str(args.rows), "--label-column", args.label_column],
+                cwd=PROJECT_PATH,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
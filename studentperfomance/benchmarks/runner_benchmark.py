@@ -0,0 +1,60 @@
+"""Compares the end-to-end wall-clock time of pipelines under the sequential runner and the ``FanOutRunner``.
+
+Every run is a fresh ``kedro run`` process, so the times include the project startup
+and the loading of every input, like a run from the command line.
+
+Run it from the project root after the pipelines have run once (their inputs must exist):
+    python benchmarks/runner_benchmark.py --repeat 3
+    python benchmarks/runner_benchmark.py --pipelines data_processing data_science_comparison
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).resolve().parents[1]
+RUNNERS = ("SequentialRunner", "studentperfomance.runner.FanOutRunner")
+# The training pipelines are left out, because they take hours
+PIPELINES = ("data_processing", "data_science_prep", "data_science_export", "data_science_pred", "data_science_comparison")
+
+
+def run(pipeline_name: str, runner: str) -> float:
+    """Runs a pipeline in a new process and returns its wall-clock time."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "kedro", "run", "--pipeline", pipeline_name, "--runner", runner],
+        cwd=PROJECT_PATH, check=True, capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pipelines", nargs="+", default=list(PIPELINES))
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per pipeline and runner, the median is reported.")
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    results = []
+    for pipeline_name in args.pipelines:
+        times = {runner: [] for runner in RUNNERS}
+        for _ in range(args.repeat):
+            # The runners take turns, so a change of the host load affects both alike
+            for runner in RUNNERS:
+                times[runner].append(run(pipeline_name, runner))
+        sequential, fan_out = (statistics.median(runner_times) for runner_times in times.values())
+        results.append({
+            "pipeline": pipeline_name,
+            "sequential_s": round(sequential, 2),
+            "fan_out_s": round(fan_out, 2),
+            "speedup": round(sequential / fan_out, 2),
+        })
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Measures how the pipelines scale with the number of raw rows.
+
+For every size, synthetic raw data imitating ``data/01_raw/student_performance_factors.csv``
+(see ``studentperfomance.synthetic``) is written to a temporary copy of the data folder, and the
+pipelines run on it one after another, each in a fresh Python process. The AutoGluon training is
+replaced by a stub that predicts the mean score, so the stages around it are measured in minutes
+instead of hours, and the comparison only runs the metrics node, which does not need AutoGluon.
+It reports the wall-clock time, the throughput in raw rows per second and the peak memory of every stage.
+
+Run it from the project root:
+    python benchmarks/scaling_benchmark.py --rows 10000 1000000 10000000
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_PATH = Path(__file__).resolve().parents[1]
+RAW_DATA = PROJECT_PATH / "data" / "01_raw" / "student_performance_factors.csv"
+STAGES = ("data_processing", "data_science_prep", "data_science_training", "data_science_export", "data_science_pred", "data_science_comparison")
+# Datasets of AutoGluon predictors, saved as pickles of the stub predictors
+MODEL_DATASETS = (
+    "autogluon_tabular_model",
+    "autogluon_tabular_nn_model",
+    "autogluon_multimodal_model",
+    "autogluon_tabular_inference_artifact",
+    "autogluon_tabular_nn_inference_artifact",
+)
+
+
+class MeanPredictor:
+    """Stand-in for the AutoGluon predictors, which predicts the mean score of the training data."""
+
+    model_best = "Mean"
+
+    def __init__(self, label: str, path: str):
+        self.label = label
+        self.path = path
+        self.mean = None
+
+    def fit(self, train_data):
+        self.mean = float(train_data[self.label].mean())
+        return self
+
+    def predict(self, data):
+        import pandas as pd
+
+        return pd.Series(self.mean, index=data.index, name=self.label)
+
+
+def train_stub(train_data, label_column: str, training: dict) -> MeanPredictor:
+    return MeanPredictor(label_column, path="stub").fit(train_data)
+
+
+def _pipeline(stage: str):
+    from kedro.pipeline import Pipeline, node
+    from studentperfomance.pipelines import data_science_comparison
+    from studentperfomance.pipelines import data_processing, data_science_export, data_science_pred, data_science_prep
+
+    if stage == "data_science_training":
+        return Pipeline([
+            node(train_stub, ["student_performance_factors_train_data@pandas", "params:label_column", "params:training"], model)
+            for model in MODEL_DATASETS[:3]
+        ])
+    if stage == "data_science_comparison":
+        return data_science_comparison.create_pipeline().only_nodes("calculate_accuracies_node")
+    modules = {
+        "data_processing": data_processing,
+        "data_science_prep": data_science_prep,
+        "data_science_export": data_science_export,
+        "data_science_pred": data_science_pred,
+    }
+    return modules[stage].create_pipeline()
+
+
+def _catalog(data_dir: Path):
+    """Creates the project catalog with all files moved into `data_dir`."""
+    from kedro.config import OmegaConfigLoader
+    from kedro.io import DataCatalog, MemoryDataset
+
+    config_loader = OmegaConfigLoader(conf_source=str(PROJECT_PATH / "conf"), base_env="base", default_run_env="base")
+    catalog_config = config_loader["catalog"]
+    for name, config in catalog_config.items():
+        config["filepath"] = str(data_dir / Path(config["filepath"]).relative_to("data"))
+        if name in MODEL_DATASETS:
+            catalog_config[name] = {"type": "pickle.PickleDataset", "filepath": config["filepath"] + ".pkl"}
+
+    catalog = DataCatalog.from_config(catalog_config)
+    for name, value in config_loader["parameters"].items():
+        catalog.add(f"params:{name}", MemoryDataset(value, copy_mode="assign"))
+    return catalog
+
+
+def _peak_rss_mb() -> float:
+    import psutil
+
+    memory = psutil.Process().memory_info()
+    if hasattr(memory, "peak_wset"):  # Windows
+        return memory.peak_wset / 1024**2
+    try:
+        # Unlike ru_maxrss, the high-water mark of Linux does not include the memory of the parent process
+        with open("/proc/self/status") as status:
+            return next(int(line.split()[1]) for line in status if line.startswith("VmHWM")) / 1024
+    except OSError:
+        import resource
+
+        # ru_maxrss is in bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024**2
+
+
+def measure(stage: str, data_dir: Path) -> dict:
+    """Runs a stage on the data in `data_dir` in this process and measures it."""
+    from kedro.framework.startup import bootstrap_project
+    from kedro.runner import SequentialRunner
+
+    bootstrap_project(PROJECT_PATH)
+    pipeline = _pipeline(stage)
+    catalog = _catalog(data_dir)
+    start = time.perf_counter()
+    SequentialRunner().run(pipeline, catalog)
+    return {"wall_s": time.perf_counter() - start, "peak_rss_mb": _peak_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", nargs="+", type=int, default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--random-state", type=int, default=42)
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.data_dir)))
+        return
+
+    import pandas as pd
+    import yaml
+
+    sys.path.insert(0, str(PROJECT_PATH / "src"))
+    from studentperfomance.synthetic import fit_gaussian_copula, write_synthetic_csv
+
+    parameters = yaml.safe_load((PROJECT_PATH / "conf" / "base" / "parameters.yml").read_text())
+    model = fit_gaussian_copula(pd.read_csv(RAW_DATA), levels=parameters["schema"]["categorical"])
+
+    results = []
+    for num_rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_dir = Path(tmp_dir) / "data"
+            start = time.perf_counter()
+            write_synthetic_csv(model, data_dir / RAW_DATA.relative_to(PROJECT_PATH / "data"), num_rows, args.random_state)
+            results.append({"rows": num_rows, "stage": "generate_synthetic_data", "wall_s": time.perf_counter() - start, "peak_rss_mb": None})
+
+            for stage in args.stages:
+                output = subprocess.run(
+                    [sys.executable, __file__, "--measure", stage, "--data-dir", str(data_dir)],
+                    cwd=PROJECT_PATH, check=True, capture_output=True, text=True,
+                ).stdout
+                results.append({"rows": num_rows, "stage": stage, **json.loads(output.strip().splitlines()[-1])})
+
+    report = pd.DataFrame(results)
+    report["rows_per_s"] = (report["rows"] / report["wall_s"]).round(0)
+    print(report.round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
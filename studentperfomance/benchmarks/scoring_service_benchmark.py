@@ -0,0 +1,97 @@
+"""Load generator for the local scoring service.
+
+Sends single-student requests from concurrent keep-alive clients to a running
+``python -m studentperfomance.scoring_service`` and reports the client-side
+latency and throughput together with the service's own ``/metrics``.
+
+Run it from the project root while the service is up:
+    python benchmarks/scoring_service_benchmark.py --clients 1 8 32 --requests 500
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+PROJECT_PATH = Path(__file__).resolve().parents[1]
+TEST_DATA = PROJECT_PATH / "data" / "04_test_data" / "student_performance_factors_test_data"
+
+
+def _client(url, students: list[str], latencies: list[float]):
+    connection = http.client.HTTPConnection(url.hostname, url.port)
+    headers = {"Content-Type": "application/json"}
+    for body in students:
+        start = time.perf_counter()
+        connection.request("POST", "/predict", body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"Request failed with status {response.status}")
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def run_load(url, students: list[str], clients: int, requests_per_client: int) -> dict:
+    """Sends ``requests_per_client`` requests from each of ``clients`` threads."""
+    latencies = [[] for _ in range(clients)]
+    threads = [
+        threading.Thread(
+            target=_client,
+            args=(url, [students[(i * requests_per_client + j) % len(students)] for j in range(requests_per_client)], latencies[i]),
+        )
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    all_latencies = np.concatenate([np.asarray(client_latencies) for client_latencies in latencies]) * 1000
+    return {
+        "clients": clients,
+        "requests": all_latencies.size,
+        "p50_ms": round(float(np.percentile(all_latencies, 50)), 3),
+        "p99_ms": round(float(np.percentile(all_latencies, 99)), 3),
+        "throughput_rps": round(all_latencies.size / elapsed, 1),
+    }
+
+
+def _service_metrics(url) -> dict:
+    connection = http.client.HTTPConnection(url.hostname, url.port)
+    connection.request("GET", "/metrics")
+    metrics = json.loads(connection.getresponse().read())
+    connection.close()
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per client.")
+    parser.add_argument("--label-column", default="Exam_Score")
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    test_data = pd.read_parquet(TEST_DATA).drop(columns=[args.label_column])
+    students = [json.dumps(student) for student in test_data.astype(object).to_dict(orient="records")]
+
+    results = []
+    for clients in args.clients:
+        result = run_load(url, students, clients, args.requests)
+        service = _service_metrics(url)
+        result.update({f"service_{key}": value for key, value in service.items() if key != "requests_total"})
+        results.append(result)
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
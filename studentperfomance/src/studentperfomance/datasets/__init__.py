@@ -0,0 +1,8 @@
+"""Custom Kedro datasets of the project."""
+
+from .chunked_parquet_dataset import ChunkedParquetDataset
+from .model_store_dataset import ModelHandle, ModelStoreDataset
+from .rendered_figure_dataset import RenderedFigureDataset
+from .tabular_predictor_artifact_dataset import TabularPredictorArtifactDataset
+
+__all__ = ["ChunkedParquetDataset", "ModelHandle", "ModelStoreDataset", "RenderedFigureDataset", "TabularPredictorArtifactDataset"]
@@ -0,0 +1,97 @@
+"""``ChunkedParquetDataset`` streams Parquet data in row batches."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow.parquet as pq
+from kedro.io import AbstractDataset
+
+
+class ChunkedParquetDataset(AbstractDataset[pd.DataFrame, Iterator[pd.DataFrame]]):
+    """Loads a Parquet file or a directory of Parquet parts as a lazy iterator of
+    DataFrames and saves DataFrames as consecutive part files of a directory.
+
+    Nodes can therefore process data bigger than memory batch by batch. Every
+    call to ``save`` appends one part, which is how Kedro saves the chunks
+    yielded by generator nodes. The first save of a run replaces the parts of
+    the previous run.
+
+    Example catalog entry:
+
+    .. code-block:: yaml
+
+        student_performance_factors_test_data@batches:
+          type: studentperfomance.datasets.ChunkedParquetDataset
+          filepath: data/04_test_data/student_performance_factors_test_data
+          load_args:
+            batch_size: 65536
+    """
+
+    DEFAULT_LOAD_ARGS: dict[str, Any] = {"batch_size": 65_536, "memory_map": True}
+    DEFAULT_SAVE_ARGS: dict[str, Any] = {}
+
+    def __init__(
+        self,
+        *,
+        filepath: str,
+        load_args: dict[str, Any] | None = None,
+        save_args: dict[str, Any] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Creates a new instance of ``ChunkedParquetDataset``.
+
+        Args:
+            filepath: Path to a Parquet file or to a directory of Parquet parts.
+                Saving always writes parts into a directory.
+            load_args: ``batch_size`` (rows per loaded DataFrame), ``columns``
+                and ``memory_map`` of ``pyarrow.parquet.ParquetFile``.
+            save_args: Additional options of ``pandas.DataFrame.to_parquet``.
+            metadata: Any arbitrary metadata, ignored by Kedro.
+        """
+        self._filepath = Path(filepath)
+        self._load_args = {**self.DEFAULT_LOAD_ARGS, **(load_args or {})}
+        self._save_args = {**self.DEFAULT_SAVE_ARGS, **(save_args or {})}
+        self.metadata = metadata
+        self._parts_saved = 0
+
+    def load(self) -> Iterator[pd.DataFrame]:
+        return self._iter_batches(self._parts())
+
+    def save(self, data: pd.DataFrame | Iterable[pd.DataFrame]) -> None:
+        if self._parts_saved == 0:
+            self._filepath.mkdir(parents=True, exist_ok=True)
+            for part in self._parts():
+                part.unlink()
+
+        frames = [data] if isinstance(data, pd.DataFrame) else data
+        for frame in frames:
+            part = self._filepath / f"part-{self._parts_saved:05d}.parquet"
+            frame.to_parquet(part, engine="pyarrow", index=False, **self._save_args)
+            self._parts_saved += 1
+
+    def _parts(self) -> list[Path]:
+        if self._filepath.is_dir():
+            return sorted(self._filepath.glob("*.parquet"))
+        return [self._filepath] if self._filepath.exists() else []
+
+    def _iter_batches(self, parts: list[Path]) -> Iterator[pd.DataFrame]:
+        for part in parts:
+            parquet_file = pq.ParquetFile(part, memory_map=self._load_args["memory_map"])
+            for batch in parquet_file.iter_batches(
+                batch_size=self._load_args["batch_size"],
+                columns=self._load_args.get("columns"),
+            ):
+                yield batch.to_pandas()
+
+    def _exists(self) -> bool:
+        return bool(self._parts())
+
+    def _describe(self) -> dict[str, Any]:
+        return {
+            "filepath": str(self._filepath),
+            "load_args": self._load_args,
+            "save_args": self._save_args,
+        }
@@ -0,0 +1,193 @@
+"""``ModelStoreDataset`` loads pickled models lazily through a shared, memory-capped LRU cache."""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from kedro.io import AbstractDataset
+
+logger = logging.getLogger(__name__)
+
+
+class ModelStoreDataset(AbstractDataset[Any, "ModelHandle"]):
+    """Saves a model, e.g. an AutoGluon predictor, as a pickle and loads it as a
+    lightweight ``ModelHandle``. The model is only unpickled when an attribute of
+    the handle is used for the first time, so a node that takes several models as
+    inputs only pays for the ones it actually calls, including the imports they
+    need (e.g. ``torch`` for the multimodal predictor).
+
+    The loaded models are kept in an LRU cache shared by all ``ModelStoreDataset``
+    of the process, so datasets of the same file (like the ``_previous`` aliases)
+    share one copy. When the estimated memory of the cached models exceeds
+    ``max_memory_mb``, the least recently used ones are dropped and loaded again
+    on their next use. NumPy arrays in the pickles are memory-mapped instead of
+    read into memory.
+
+    Example catalog entry:
+
+    .. code-block:: yaml
+
+        autogluon_tabular_model:
+          type: studentperfomance.datasets.ModelStoreDataset
+          filepath: data/05_models/autogluon_tabular_model.pkl
+          load_args:
+            max_memory_mb: 4096
+    """
+
+    DEFAULT_LOAD_ARGS: dict[str, Any] = {"mmap_mode": "r", "max_memory_mb": 4096}
+    DEFAULT_SAVE_ARGS: dict[str, Any] = {"compress": 0}
+
+    def __init__(
+        self,
+        *,
+        filepath: str,
+        load_args: dict[str, Any] | None = None,
+        save_args: dict[str, Any] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Creates a new instance of ``ModelStoreDataset``.
+
+        Args:
+            filepath: Path of the pickle.
+            load_args: ``mmap_mode`` of ``joblib.load`` (``null`` reads the arrays
+                into memory) and ``max_memory_mb``, the memory cap of the shared
+                cache. The cache uses the smallest cap of all its datasets.
+            save_args: Additional options of ``joblib.dump``, uncompressed arrays
+                can be memory-mapped.
+            metadata: Any arbitrary metadata, ignored by Kedro.
+        """
+        self._filepath = Path(filepath)
+        self._load_args = {**self.DEFAULT_LOAD_ARGS, **(load_args or {})}
+        self._save_args = {**self.DEFAULT_SAVE_ARGS, **(save_args or {})}
+        self.metadata = metadata
+        MODEL_CACHE.limit(self._load_args["max_memory_mb"])
+
+    def load(self) -> ModelHandle:
+        return ModelHandle(str(self._filepath), self._load_args["mmap_mode"])
+
+    def save(self, data) -> None:
+        import joblib
+
+        if isinstance(data, ModelHandle):
+            data = data.unwrap()
+        MODEL_CACHE.evict(str(self._filepath))
+        self._filepath.parent.mkdir(parents=True, exist_ok=True)
+        # A reader never sees a half written file
+        temporary_path = self._filepath.with_name(self._filepath.name + ".tmp")
+        joblib.dump(data, temporary_path, **self._save_args)
+        os.replace(temporary_path, self._filepath)
+
+    def _exists(self) -> bool:
+        return self._filepath.exists()
+
+    def _release(self) -> None:
+        # The run has no more consumers of this model
+        MODEL_CACHE.evict(str(self._filepath))
+
+    def _describe(self) -> dict[str, Any]:
+        return {
+            "filepath": str(self._filepath),
+            "load_args": self._load_args,
+            "save_args": self._save_args,
+        }
+
+
+class ModelHandle:
+    """Stands in for the model in a ``ModelStoreDataset`` file. Attribute access is
+    forwarded to the model, which is loaded from the shared cache on first use.
+
+    A handle is pickled as the path and the modification time and size of the file,
+    so it is cheap to send to worker processes and its pickle changes with the model.
+    """
+
+    def __init__(self, filepath: str, mmap_mode: str | None = "r"):
+        self._filepath = filepath
+        self._mmap_mode = mmap_mode
+        stat = os.stat(filepath)
+        self._signature = (stat.st_mtime_ns, stat.st_size)
+
+    def unwrap(self):
+        """Returns the model, loading it if it is not cached."""
+        return MODEL_CACHE.get(self._filepath, self._signature, self._mmap_mode)
+
+    def __getattr__(self, name: str):
+        # Called for attributes the handle does not have, not for the ones set in `__init__`
+        if name.startswith("__") or name in ("_filepath", "_mmap_mode", "_signature"):
+            raise AttributeError(name)
+        return getattr(self.unwrap(), name)
+
+    def __getstate__(self) -> dict:
+        return {"_filepath": self._filepath, "_mmap_mode": self._mmap_mode, "_signature": self._signature}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+
+    def __repr__(self) -> str:
+        return f"ModelHandle({self._filepath!r})"
+
+
+class ModelCache:
+    """LRU cache of loaded models by file path with a cap of their estimated memory."""
+
+    def __init__(self, max_memory_mb: float | None = None):
+        self.max_memory_mb = max_memory_mb
+        self._models: OrderedDict[str, tuple[tuple, Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
+
+    def limit(self, max_memory_mb: float | None):
+        with self._lock:
+            if max_memory_mb is not None and (self.max_memory_mb is None or max_memory_mb < self.max_memory_mb):
+                self.max_memory_mb = max_memory_mb
+
+    def get(self, filepath: str, signature: tuple, mmap_mode: str | None):
+        with self._lock:
+            load_lock = self._load_locks.setdefault(filepath, threading.Lock())
+        # Only one thread loads a model, the others wait for it, while other models load concurrently
+        with load_lock:
+            with self._lock:
+                cached = self._models.get(filepath)
+                if cached is not None and cached[0] == signature:
+                    self._models.move_to_end(filepath)
+                    return cached[1]
+
+            import joblib
+
+            model = joblib.load(filepath, mmap_mode=mmap_mode)
+            size = _estimated_size(model, filepath)
+            logger.info("Loaded the model '%s' (about %.1f MB)", filepath, size / 1024**2)
+            with self._lock:
+                self._models[filepath] = (signature, model, size)
+                self._evict_least_recently_used()
+            return model
+
+    def evict(self, filepath: str):
+        with self._lock:
+            self._models.pop(filepath, None)
+
+    def _evict_least_recently_used(self):
+        if self.max_memory_mb is None:
+            return
+        # The most recently used model stays, even if it exceeds the cap on its own
+        while len(self._models) > 1 and sum(size for _, _, size in self._models.values()) > self.max_memory_mb * 1024**2:
+            filepath, _ = self._models.popitem(last=False)
+            logger.info("Evicted the model '%s' from the model cache", filepath)
+
+
+def _estimated_size(model, filepath: str) -> int:
+    """
+    Estimates the memory of a model by the size of its pickle and, for AutoGluon predictors,
+    of the model directory they load their trained models from.
+    """
+    size = os.path.getsize(filepath)
+    model_path = getattr(model, "path", None)
+    if isinstance(model_path, str) and os.path.isdir(model_path):
+        size += sum(file.stat().st_size for file in Path(model_path).rglob("*") if file.is_file())
+    return size
+
+
+MODEL_CACHE = ModelCache()
@@ -0,0 +1,47 @@
+"""``RenderedFigureDataset`` saves figures that were already rendered to image bytes."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from kedro.io import AbstractDataset
+
+
+class RenderedFigureDataset(AbstractDataset[bytes, bytes]):
+    """Saves the encoded image of a figure, e.g. the PNG bytes returned by
+    ``studentperfomance.reporting.render_figures``, to a file as it is.
+
+    Unlike ``matplotlib.MatplotlibWriter`` it does not draw the figure, so the
+    drawing can happen in the worker processes that created the figures.
+
+    Example catalog entry:
+
+    .. code-block:: yaml
+
+        heatmap:
+          type: studentperfomance.datasets.RenderedFigureDataset
+          filepath: data/08_reporting/heatmap.png
+    """
+
+    def __init__(self, *, filepath: str, metadata: dict[str, Any] | None = None) -> None:
+        """Creates a new instance of ``RenderedFigureDataset``.
+
+        Args:
+            filepath: Path of the image file.
+            metadata: Any arbitrary metadata, ignored by Kedro.
+        """
+        self._filepath = Path(filepath)
+        self.metadata = metadata
+
+    def load(self) -> bytes:
+        return self._filepath.read_bytes()
+
+    def save(self, data: bytes) -> None:
+        self._filepath.parent.mkdir(parents=True, exist_ok=True)
+        self._filepath.write_bytes(data)
+
+    def _exists(self) -> bool:
+        return self._filepath.exists()
+
+    def _describe(self) -> dict[str, Any]:
+        return {"filepath": str(self._filepath)}
@@ -0,0 +1,97 @@
+"""``TabularPredictorArtifactDataset`` saves a ``TabularPredictor`` as a compact inference artifact."""
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+from kedro.io import AbstractDataset
+
+
+class TabularPredictorArtifactDataset(AbstractDataset[Any, Any]):
+    """Saves an AutoGluon ``TabularPredictor`` as a directory that only contains
+    what is needed to predict with its best model: the fitted feature pipeline,
+    the best model and the models it is built on. All other trained models and
+    the cached training data are left out.
+
+    Loading only imports ``autogluon.tabular`` and, by default, keeps the models
+    in memory, so the first prediction does not read them from disk.
+
+    Example catalog entry:
+
+    .. code-block:: yaml
+
+        autogluon_tabular_inference_artifact:
+          type: studentperfomance.datasets.TabularPredictorArtifactDataset
+          filepath: data/05_models/autogluon_tabular_inference_artifact
+          save_args:
+            compile: true
+    """
+
+    DEFAULT_LOAD_ARGS: dict[str, Any] = {"persist": True}
+    DEFAULT_SAVE_ARGS: dict[str, Any] = {"model": "best", "compile": False}
+
+    def __init__(
+        self,
+        *,
+        filepath: str,
+        load_args: dict[str, Any] | None = None,
+        save_args: dict[str, Any] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Creates a new instance of ``TabularPredictorArtifactDataset``.
+
+        Args:
+            filepath: Directory of the artifact.
+            load_args: ``persist`` keeps the models in memory after loading.
+            save_args: ``model`` is the model to keep, ``compile`` compiles the
+                kept models for faster inference (needs the optional compilers
+                of AutoGluon, e.g. ``skl2onnx`` for the random forests).
+            metadata: Any arbitrary metadata, ignored by Kedro.
+        """
+        self._filepath = Path(filepath)
+        self._load_args = {**self.DEFAULT_LOAD_ARGS, **(load_args or {})}
+        self._save_args = {**self.DEFAULT_SAVE_ARGS, **(save_args or {})}
+        self.metadata = metadata
+
+    def load(self):
+        from autogluon.tabular import TabularPredictor
+
+        predictor = TabularPredictor.load(str(self._filepath), verbosity=0)
+        if self._load_args["persist"]:
+            predictor.persist(models="best")
+        return predictor
+
+    def save(self, data) -> None:
+        from autogluon.tabular import TabularPredictor
+
+        # Built next to the artifact and swapped in at the end, so a failed clone or compile keeps the previous artifact
+        temporary_path = self._filepath.with_name(self._filepath.name + ".tmp")
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        try:
+            path = data.clone_for_deployment(path=str(temporary_path), model=self._save_args["model"])
+            if self._save_args["compile"]:
+                artifact = TabularPredictor.load(path, verbosity=0)
+                artifact.compile(models="best", with_ancestors=True)
+        except BaseException:
+            shutil.rmtree(temporary_path, ignore_errors=True)
+            raise
+
+        # A directory can only be replaced by a rename once it is out of the way
+        previous_path = self._filepath.with_name(self._filepath.name + ".previous")
+        shutil.rmtree(previous_path, ignore_errors=True)
+        if self._filepath.exists():
+            os.replace(self._filepath, previous_path)
+        os.replace(temporary_path, self._filepath)
+        shutil.rmtree(previous_path, ignore_errors=True)
+
+    def _exists(self) -> bool:
+        return (self._filepath / "predictor.pkl").exists()
+
+    def _describe(self) -> dict[str, Any]:
+        return {
+            "filepath": str(self._filepath),
+            "load_args": self._load_args,
+            "save_args": self._save_args,
+        }
@@ -0,0 +1,615 @@
+"""Project hooks."""
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+from kedro.framework.hooks import hook_impl
+from kedro.pipeline.node import Node
+
+from studentperfomance.datasets import ModelHandle
+
+logger = logging.getLogger(__name__)
+
+
+class NodeResultCacheHooks:
+    """Skips nodes that already ran with the same code, inputs and parameters.
+
+    Before a node runs, its fingerprint is computed from the source of the project
+    package (and of the module defining the node function, if it is outside of it)
+    and the content of every input, so a change in a helper module also invalidates
+    the results of the nodes using it. If a result with
+    that fingerprint is cached, the node function is swapped for one that returns
+    the cached result, so Kedro saves the cached outputs instead of recomputing
+    them. Otherwise the result is cached after the node ran. The items of generator
+    nodes are cached one by one while Kedro saves them and yielded again on a hit.
+    For AutoGluon predictors, which load their models from a directory, the files
+    of the directory are recorded next to the result, and a result whose predictor
+    directories changed or were removed since is computed anew.
+
+    Nodes with inputs that can't be fingerprinted always run.
+    The cache is bounded by ``max_size_bytes``, the least recently used results are
+    evicted after every run. Hits and misses of every run are logged and written
+    to ``<cache_dir>/reports/<session_id>.json``.
+    """
+
+    def __init__(self, cache_dir: str | Path, max_size_bytes: int = 5 * 1024**3):
+        self._cache_dir = Path(cache_dir)
+        self._max_size_bytes = max_size_bytes
+        # Worker processes of a runner create their own hooks and run nodes without a pipeline run
+        self._report: dict[str, list[str]] = {"hits": [], "misses": [], "uncacheable": []}
+        self._session_id = None
+        self._package_digest: bytes | None = None
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: dict[str, Any]):
+        self._session_id = run_params.get("session_id")
+        self._report = {"hits": [], "misses": [], "uncacheable": []}
+        self._package_digest = None
+
+    @hook_impl
+    def before_node_run(self, node: Node, catalog, inputs: dict[str, Any]):
+        fingerprint = self._fingerprint(node, catalog, inputs)
+        if fingerprint is None:
+            self._report["uncacheable"].append(node.name)
+            return
+
+        entry = self._cache_dir / f"{fingerprint}.pkl"
+        generator = inspect.isgeneratorfunction(_original_func(node))
+        if entry.exists() and _model_directories_unchanged(entry):
+            self._report["hits"].append(node.name)
+            os.utime(entry)
+            _wrap_for_one_run(node, lambda func: _cached_result(func, entry, generator))
+        else:
+            self._report["misses"].append(node.name)
+            _wrap_for_one_run(node, lambda func: _caching(func, entry, generator))
+
+    @hook_impl
+    def after_node_run(self, node: Node):
+        _set_func(node, _original_func(node))
+
+    @hook_impl
+    def on_node_error(self, node: Node):
+        _set_func(node, _original_func(node))
+
+    @hook_impl
+    def after_pipeline_run(self):
+        self._evict()
+        logger.info(
+            "Node result cache: %d hits, %d misses, %d uncacheable",
+            len(self._report["hits"]), len(self._report["misses"]), len(self._report["uncacheable"]),
+        )
+        reports_dir = self._cache_dir / "reports"
+        reports_dir.mkdir(parents=True, exist_ok=True)
+        (reports_dir / f"{self._session_id}.json").write_text(json.dumps(self._report, indent=2))
+
+    def _fingerprint(self, node: Node, catalog, inputs: dict[str, Any]) -> str | None:
+        digest = hashlib.blake2b(digest_size=20)
+        try:
+            if self._package_digest is None:
+                self._package_digest = _hash_package_source()
+            digest.update(self._package_digest)
+            func = _original_func(node)
+            digest.update(Path(inspect.getsourcefile(func)).read_bytes())
+            digest.update(func.__qualname__.encode())
+            for name in sorted(inputs):
+                digest.update(name.encode())
+                digest.update(_fingerprint_input(name, inputs[name], catalog))
+        except (TypeError, OSError, pickle.PicklingError) as exc:
+            logger.debug("Node '%s' can't be fingerprinted: %s", node.name, exc)
+            return None
+        return digest.hexdigest()
+
+    def _evict(self):
+        entries = sorted(self._cache_dir.glob("*.pkl"), key=lambda entry: entry.stat().st_mtime, reverse=True)
+        size = 0
+        for entry in entries:
+            size += entry.stat().st_size
+            if size > self._max_size_bytes:
+                entry.unlink()
+                _model_directories_file(entry).unlink(missing_ok=True)
+
+
+def _fingerprint_input(name: str, data: Any, catalog) -> bytes:
+    """Fingerprints parameters by value, DataFrames by their row hashes and anything
+    else by the files of its dataset, falling back to the pickled object."""
+    if name.startswith("params:") or name == "parameters":
+        return json.dumps(data, sort_keys=True, default=str).encode()
+    if isinstance(data, pd.DataFrame):
+        digest = hashlib.blake2b(pd.util.hash_pandas_object(data).to_numpy().tobytes())
+        digest.update(repr(list(data.dtypes.items())).encode())
+        return digest.digest()
+
+    filepath = _dataset_filepath(catalog, name)
+    if filepath is not None and filepath.exists():
+        return _hash_files(filepath)
+    return hashlib.blake2b(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)).digest()
+
+
+def _dataset_filepath(catalog, name: str) -> Path | None:
+    """The file of a dataset from its catalog configuration, None for parameters and memory datasets."""
+    filepath = catalog.config_resolver.resolve_pattern(name).get("filepath")
+    return Path(filepath) if filepath else None
+
+
+def _hash_package_source() -> bytes:
+    """Hashes the source of every module of the project package."""
+    package_dir = Path(__file__).parent
+    digest = hashlib.blake2b()
+    for file in sorted(package_dir.rglob("*.py")):
+        digest.update(file.relative_to(package_dir).as_posix().encode())
+        digest.update(file.read_bytes())
+    return digest.digest()
+
+
+def _hash_files(path: Path) -> bytes:
+    digest = hashlib.blake2b()
+    files = sorted(file for file in path.rglob("*") if file.is_file()) if path.is_dir() else [path]
+    for file in files:
+        digest.update(file.name.encode())
+        with file.open("rb") as stream:
+            while chunk := stream.read(1024**2):
+                digest.update(chunk)
+    return digest.digest()
+
+
+def _cached_result(func: Callable, entry: Path, generator: bool) -> Callable:
+    if generator:
+        @functools.wraps(func)
+        def yield_cached_items(*args, **kwargs):
+            with entry.open("rb") as stream:
+                while True:
+                    try:
+                        yield pickle.load(stream)
+                    except EOFError:
+                        return
+
+        return yield_cached_items
+
+    @functools.wraps(func)
+    def load_cached_result(*args, **kwargs):
+        with entry.open("rb") as stream:
+            return pickle.load(stream)
+
+    return load_cached_result
+
+
+def _caching(func: Callable, entry: Path, generator: bool) -> Callable:
+    partial_entry = entry.with_suffix(".partial")
+
+    def dump(data: Any, stream) -> bool:
+        try:
+            pickle.dump(data, stream, protocol=pickle.HIGHEST_PROTOCOL)
+        except (TypeError, AttributeError, pickle.PicklingError) as exc:
+            logger.warning("The result of '%s' can't be cached: %s", func.__qualname__, exc)
+            return False
+        return True
+
+    def commit(model_directories: dict[str, str]):
+        _model_directories_file(entry).write_text(json.dumps(model_directories))
+        partial_entry.replace(entry)
+
+    if generator:
+        @functools.wraps(func)
+        def yield_and_cache(*args, **kwargs):
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            model_directories, cacheable = {}, True
+            try:
+                with partial_entry.open("wb") as stream:
+                    for item in func(*args, **kwargs):
+                        cacheable = cacheable and dump(item, stream)
+                        model_directories.update(_model_directories(item))
+                        yield item
+                if cacheable:
+                    commit(model_directories)
+            finally:
+                partial_entry.unlink(missing_ok=True)
+
+        return yield_and_cache
+
+    @functools.wraps(func)
+    def run_and_cache(*args, **kwargs):
+        result = func(*args, **kwargs)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with partial_entry.open("wb") as stream:
+                cacheable = dump(result, stream)
+            if cacheable:
+                commit(_model_directories(result))
+        finally:
+            partial_entry.unlink(missing_ok=True)
+        return result
+
+    return run_and_cache
+
+
+def _model_directories(result: Any) -> dict[str, str]:
+    """
+    Signatures of the directories that predictors in the result of a node load their models
+    from, like the ``path`` of AutoGluon predictors.
+    """
+    if isinstance(result, dict):
+        values = result.values()
+    elif isinstance(result, (tuple, list)):
+        values = result
+    else:
+        values = (result,)
+    directories = {}
+    for value in values:
+        # A handle only points to the file of an input of the node, which is part of the fingerprint
+        path = None if isinstance(value, ModelHandle) else getattr(value, "path", None)
+        if isinstance(path, str) and os.path.isdir(path):
+            directories[path] = _directory_signature(Path(path))
+    return directories
+
+
+def _model_directories_unchanged(entry: Path) -> bool:
+    model_directories_file = _model_directories_file(entry)
+    if not model_directories_file.exists():
+        return False
+    model_directories = json.loads(model_directories_file.read_text())
+    return all(
+        Path(path).is_dir() and _directory_signature(Path(path)) == signature
+        for path, signature in model_directories.items()
+    )
+
+
+def _model_directories_file(entry: Path) -> Path:
+    return entry.with_suffix(".models.json")
+
+
+def _directory_signature(directory: Path) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    for file in sorted(directory.rglob("*")):
+        if file.is_file():
+            stat = file.stat()
+            digest.update(f"{file.relative_to(directory).as_posix()}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def _original_func(node: Node) -> Callable:
+    """The function of a node without the wrappers that the hooks put around it for a run."""
+    return getattr(node.func, "_node_func", node.func)
+
+
+def _wrap_for_one_run(node: Node, wrapper: Callable[[Callable], Callable]):
+    """
+    Puts ``wrapper(node.func)`` in place of the function of a node for its next run. The node
+    gets its original function back as soon as it calls the wrapper, and the wrapper has the
+    name of the original function, so the node is described and logged as usual.
+    """
+    original = _original_func(node)
+    wrapped = wrapper(node.func)
+
+    @functools.wraps(original)
+    def run_once(*args, **kwargs):
+        _set_func(node, original)
+        return wrapped(*args, **kwargs)
+
+    run_once._node_func = original
+    _set_func(node, run_once)
+
+
+def _set_func(node: Node, func: Callable):
+    if node.func is not func:
+        # The setter clears the cached inputs of the node, which fails if they are not cached yet
+        node.inputs  # noqa: B018
+        node.func = func
+
+
+def _timed_generator(func: Callable, finish: Callable[[str], None]) -> Callable:
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        status = "failed"
+        try:
+            yield from func(*args, **kwargs)
+            status = "completed"
+        finally:
+            finish(status)
+
+    return timed
+
+
+class ProfilingHooks:
+    """Records where time and memory go in every run.
+
+    For every node the wall time, CPU time and peak RSS are recorded, for every
+    dataset load and save its duration, in-memory size and file size. The records
+    of a run are appended to the ``runs``, ``node_runs`` and ``dataset_io`` tables
+    of ``<reports_dir>/run_reports.db``, so regressions can be trended across runs.
+    Generator nodes are measured until their last item is saved.
+
+    Nodes listed in ``profile_nodes`` are additionally sampled every
+    ``sampling_interval_s`` seconds. Their stacks are written in the collapsed
+    format of flame graph tools (flamegraph.pl, speedscope) to
+    ``<reports_dir>/flamegraphs/<session_id>/<node>.folded``.
+
+    On Linux the peak RSS is reset before every node that runs alone, so it is the
+    peak of that node. For nodes that overlap with other nodes of a concurrent runner
+    (see ``studentperfomance.runner``), and on other platforms, it is the peak of the
+    whole process up to the end of the node. The ``peak_rss_scope`` column tells which.
+    """
+
+    def __init__(self, reports_dir: str | Path, profile_nodes: tuple[str, ...] = (), sampling_interval_s: float = 0.005):
+        self._reports_dir = Path(reports_dir)
+        self._profile_nodes = set(profile_nodes)
+        self._sampling_interval_s = sampling_interval_s
+        self._catalog = None
+        self._lock = threading.Lock()
+        # Worker processes of a runner create their own hooks and run nodes without a pipeline run
+        self._start_run({})
+
+    @hook_impl
+    def after_catalog_created(self, catalog):
+        self._catalog = catalog
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: dict[str, Any]):
+        self._start_run(run_params)
+
+    @hook_impl
+    def before_node_run(self, node: Node):
+        with self._lock:
+            if self._running_nodes:
+                # The peak is a counter of the whole process, resetting it would clear the peak of the running nodes
+                self._overlapping_nodes.update([*self._running_nodes, node.name])
+                peak_rss_scope = "process"
+            else:
+                peak_rss_scope = "node" if _reset_peak_rss() else "process"
+            self._running_nodes[node.name] = (time.perf_counter(), time.process_time(), _rss_bytes(), peak_rss_scope)
+        if node.name in self._profile_nodes:
+            sampler = _StackSampler(threading.get_ident(), self._sampling_interval_s)
+            sampler.start()
+            self._samplers[node.name] = sampler
+        if inspect.isgeneratorfunction(_original_func(node)):
+            # Kedro calls `after_node_run` as soon as the generator is created and saves its items
+            # afterwards, so the node is measured until the generator is exhausted instead
+            self._generator_nodes.add(node.name)
+            _wrap_for_one_run(node, lambda func: _timed_generator(func, functools.partial(self._finish_node, node)))
+
+    @hook_impl
+    def after_node_run(self, node: Node):
+        _set_func(node, _original_func(node))
+        if node.name not in self._generator_nodes:
+            self._finish_node(node, "completed")
+
+    @hook_impl
+    def on_node_error(self, node: Node):
+        _set_func(node, _original_func(node))
+        self._finish_node(node, "failed")
+
+    @hook_impl
+    def before_dataset_loaded(self, dataset_name: str, node: Node):
+        self._dataset_starts[("load", dataset_name, node.name)] = time.perf_counter()
+
+    @hook_impl
+    def after_dataset_loaded(self, dataset_name: str, data: Any, node: Node):
+        self._finish_dataset_io("load", dataset_name, data, node)
+
+    @hook_impl
+    def before_dataset_saved(self, dataset_name: str, node: Node):
+        self._dataset_starts[("save", dataset_name, node.name)] = time.perf_counter()
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str, data: Any, node: Node):
+        self._finish_dataset_io("save", dataset_name, data, node)
+
+    @hook_impl
+    def after_pipeline_run(self):
+        self._write_report("completed")
+
+    @hook_impl
+    def on_pipeline_error(self):
+        self._write_report("failed")
+
+    def _start_run(self, run_params: dict[str, Any]):
+        self._run = {
+            "session_id": run_params.get("session_id"),
+            "pipeline_name": run_params.get("pipeline_name") or "__default__",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "start": time.perf_counter(),
+        }
+        self._node_runs = []
+        self._dataset_io = []
+        self._running_nodes = {}
+        self._overlapping_nodes = set()
+        self._dataset_starts = {}
+        self._samplers = {}
+        self._generator_nodes = set()
+
+    def _finish_node(self, node: Node, status: str):
+        with self._lock:
+            if node.name not in self._running_nodes:
+                # A generator node that failed before it was iterated
+                return
+            wall_start, cpu_start, rss_start, peak_rss_scope = self._running_nodes.pop(node.name)
+            self._generator_nodes.discard(node.name)
+            if node.name in self._overlapping_nodes:
+                self._overlapping_nodes.discard(node.name)
+                peak_rss_scope = "process"
+        sampler = self._samplers.pop(node.name, None)
+        if sampler is not None:
+            self._write_flamegraph(node.name, sampler.stop())
+
+        with self._lock:
+            self._node_runs.append({
+                "node": node.name,
+                "status": status,
+                "wall_s": time.perf_counter() - wall_start,
+                # CPU time of the whole process, nodes running concurrently share it
+                "cpu_s": time.process_time() - cpu_start,
+                "rss_delta_bytes": _difference(_rss_bytes(), rss_start),
+                "peak_rss_bytes": _peak_rss_bytes(),
+                "peak_rss_scope": peak_rss_scope,
+            })
+
+    def _finish_dataset_io(self, operation: str, dataset_name: str, data: Any, node: Node):
+        start = self._dataset_starts.pop((operation, dataset_name, node.name), None)
+        if start is None:
+            return
+        with self._lock:
+            self._dataset_io.append({
+                "dataset": dataset_name,
+                "node": node.name,
+                "operation": operation,
+                "seconds": time.perf_counter() - start,
+                "memory_bytes": _memory_bytes(data),
+                "file_bytes": self._file_bytes(dataset_name),
+            })
+
+    def _file_bytes(self, dataset_name: str) -> int | None:
+        if self._catalog is None:
+            return None
+        path = _dataset_filepath(self._catalog, dataset_name)
+        if path is None or not path.exists():
+            return None
+        return sum(file.stat().st_size for file in path.rglob("*") if file.is_file()) if path.is_dir() else path.stat().st_size
+
+    def _write_flamegraph(self, node_name: str, stacks: Counter):
+        flamegraphs_dir = self._reports_dir / "flamegraphs" / str(self._run["session_id"])
+        flamegraphs_dir.mkdir(parents=True, exist_ok=True)
+        lines = (f"{stack} {count}" for stack, count in stacks.most_common())
+        (flamegraphs_dir / f"{node_name}.folded").write_text("\n".join(lines) + "\n")
+
+    def _write_report(self, status: str):
+        wall_s = time.perf_counter() - self._run["start"]
+        session_id = self._run["session_id"]
+        self._reports_dir.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self._reports_dir / "run_reports.db")) as connection, connection:
+            connection.executescript(_REPORT_SCHEMA)
+            connection.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?)",
+                (session_id, self._run["pipeline_name"], self._run["started_at"], wall_s, status),
+            )
+            connection.executemany(
+                "INSERT INTO node_runs VALUES (:session_id, :node, :status, :wall_s, :cpu_s, "
+                ":rss_delta_bytes, :peak_rss_bytes, :peak_rss_scope)",
+                [{"session_id": session_id, **record} for record in self._node_runs],
+            )
+            connection.executemany(
+                "INSERT INTO dataset_io VALUES (:session_id, :dataset, :node, :operation, :seconds, "
+                ":memory_bytes, :file_bytes)",
+                [{"session_id": session_id, **record} for record in self._dataset_io],
+            )
+
+        slowest = sorted(self._node_runs, key=lambda record: record["wall_s"], reverse=True)[:5]
+        logger.info(
+            "Run took %.1f s, slowest nodes: %s",
+            wall_s, ", ".join(f"{record['node']} ({record['wall_s']:.1f} s)" for record in slowest),
+        )
+
+
+_REPORT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    session_id TEXT, pipeline_name TEXT, started_at TEXT, wall_s REAL, status TEXT
+);
+CREATE TABLE IF NOT EXISTS node_runs (
+    session_id TEXT, node TEXT, status TEXT, wall_s REAL, cpu_s REAL,
+    rss_delta_bytes INTEGER, peak_rss_bytes INTEGER, peak_rss_scope TEXT
+);
+CREATE TABLE IF NOT EXISTS dataset_io (
+    session_id TEXT, dataset TEXT, node TEXT, operation TEXT, seconds REAL,
+    memory_bytes INTEGER, file_bytes INTEGER
+);
+"""
+
+
+class _StackSampler:
+    """Samples the stack of one thread and counts the collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval_s: float):
+        self._thread_id = thread_id
+        self._interval_s = interval_s
+        self._stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stopped.set()
+        self._thread.join()
+        return self._stacks
+
+    def _sample(self):
+        while not self._stopped.wait(self._interval_s):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self._stacks[";".join(reversed(stack))] += 1
+
+
+def _memory_bytes(data: Any) -> int | None:
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(deep=True).sum())
+    if isinstance(data, (bytes, str)):
+        return len(data)
+    return None
+
+
+def _difference(value: int | None, start: int | None) -> int | None:
+    return None if value is None or start is None else value - start
+
+
+def _proc_status_bytes(field: str) -> int | None:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(field):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _rss_bytes() -> int | None:
+    rss = _proc_status_bytes("VmRSS")
+    if rss is None:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        rss = psutil.Process().memory_info().rss
+    return rss
+
+
+def _peak_rss_bytes() -> int | None:
+    peak = _proc_status_bytes("VmHWM")
+    if peak is None:
+        try:
+            import resource
+        except ImportError:
+            return None
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return peak
+
+
+def _reset_peak_rss() -> bool:
+    """Resets the peak RSS of the process, which is only possible on Linux."""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        return False
+    return True
@@ -3,13 +3,23 @@
 from kedro.framework.project import find_pipelines
 from kedro.pipeline import Pipeline
 
+from studentperfomance.pipelines import data_science_comparison, data_science_training
+
 
 def register_pipelines() -> dict[str, Pipeline]:
     """Register the project's pipelines.
 
+    Alternative modes of a pipeline are registered after ``__default__``,
+    because they produce the same outputs as the pipeline they replace.
+
     Returns:
         A mapping from pipeline names to ``Pipeline`` objects.
     """
     pipelines = find_pipelines()
     pipelines["__default__"] = sum(pipelines.values())
-    return pipelines
\ No newline at end of file
+    pipelines["data_science_training_parallel"] = data_science_training.create_parallel_pipeline()
+    pipelines["data_science_training_incremental"] = data_science_training.create_incremental_pipeline()
+    # Not an alternative mode, but a tool that is only run on its own
+    pipelines["data_science_sweep"] = data_science_training.create_sweep_pipeline()
+    pipelines["data_science_comparison_cv"] = data_science_comparison.create_cv_pipeline()
+    return pipelines
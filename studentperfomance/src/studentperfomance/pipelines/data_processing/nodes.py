@@ -1,147 +1,505 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 
-def preprocess_student_performance_factors(student_performance_factors: pd.DataFrame) -> pd.DataFrame:
-    """Preprocesses the data by removing missing values -> because it does not make sense to synthesize them.
+from studentperfomance.reporting import render_figures, scatter_or_hexbin
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+logger = logging.getLogger(__name__)
+
+def preprocess_student_performance_factors(student_performance_factors: Iterable[pd.DataFrame], schema: dict, validation: dict) -> Iterator[tuple[pd.DataFrame, pd.DataFrame]]:
+    """Preprocesses the raw data chunk by chunk, so the memory use does not grow with the size of the raw file.
+    Every chunk is validated against the schema and cleaned on its own and saved as one part of the preprocessed data.
+    Rows that violate the schema are quarantined, i.e. left out of the preprocessed data and counted in the
+    violations report. The run is aborted as soon as the share of quarantined rows exceeds `max_violation_fraction`,
+    so broken raw data fails before the training instead of during it. The violations report is still saved before
+    the abort. The parts of the preprocessed data saved until then are left as they are, an incomplete output that
+    the next run replaces.
+
+    Args:
+        student_performance_factors: Chunks of the raw data.
+        schema: The column schema with the levels of every categorical column, the bounds of every
+            numeric column and the optional columns.
+        validation: The validation parameters.
+    Yields:
+        Chunks of the preprocessed data and the violations report of all chunks validated so far.
+    Raises:
+        ValueError: If columns of the schema are missing or the share of quarantined rows is too large.
+    """
+    counts: dict[tuple[str, str], int] = {}
+    examples: dict[tuple[str, str], list] = {}
+    num_rows = num_quarantined = 0
+    for chunk in student_performance_factors:
+        violations = validate_student_performance_factors(chunk, schema)
+        quarantined = np.zeros(len(chunk), dtype=bool)
+        for key, violating in violations.items():
+            quarantined |= violating
+            counts[key] = counts.get(key, 0) + int(violating.sum())
+            key_examples = examples.setdefault(key, [])
+            if len(key_examples) < _NUM_VIOLATION_EXAMPLES:
+                for value in chunk[key[0]].to_numpy()[violating]:
+                    if len(key_examples) == _NUM_VIOLATION_EXAMPLES:
+                        break
+                    if value not in key_examples:
+                        key_examples.append(value)
+        num_rows += len(chunk)
+        num_quarantined += int(quarantined.sum())
+
+        report = _violations_report(counts, examples, num_rows, num_quarantined)
+        if num_quarantined > validation["max_violation_fraction"] * num_rows:
+            logger.error("Schema violations of the raw data:\n%s", report.to_string(index=False))
+            # Kedro saves every yielded item, so the report of the aborted run is written with an empty last part
+            yield clean_student_performance_factors(chunk.iloc[:0], schema), report
+            logger.warning(
+                "The preprocessed data only holds the chunks before the abort and is replaced by the next run"
+            )
+            raise ValueError(
+                f"{num_quarantined} of the first {num_rows} raw rows violate the schema, more than the allowed "
+                f"fraction of {validation['max_violation_fraction']}"
+            )
+        yield clean_student_performance_factors(chunk[~quarantined], schema), report
+
+def validate_student_performance_factors(student_performance_factors: pd.DataFrame, schema: dict) -> dict[tuple[str, str], np.ndarray]:
+    """Checks every column declared in the schema with vectorized comparisons, without a loop over the rows.
+
+    The rules are:
+        - `missing`: a missing value in a column that is not optional.
+        - `not_integer`: a value of a numeric column that is not a whole number.
+        - `out_of_bounds`: a value of a numeric column outside of its declared bounds.
+        - `unknown_level`: a value of a categorical column that is not one of its declared levels.
 
     Args:
         student_performance_factors: Raw data.
+        schema: The column schema.
+    Returns:
+        The rows that violate a rule as a boolean mask per `(column, rule)`, only for the rules with violations.
+    Raises:
+        ValueError: If columns of the schema are missing.
+    """
+    missing_columns = [column for column in [*schema["numeric"], *schema["categorical"]] if column not in student_performance_factors.columns]
+    if missing_columns:
+        raise ValueError(f"The data does not have the columns {missing_columns} of the schema")
+
+    violations = {}
+    for column, (low, high) in schema["numeric"].items():
+        values = student_performance_factors[column]
+        if pd.api.types.is_integer_dtype(values.dtype) and not values.hasnans:
+            # The common case of a column the CSV reader parsed as integers only needs the bounds
+            numbers = values.to_numpy()
+        else:
+            parsed = pd.to_numeric(values, errors="coerce")
+            numbers = parsed.to_numpy(dtype=float, na_value=np.nan)
+            missing = values.isna().to_numpy()
+            if column not in schema["optional"]:
+                violations[column, "missing"] = missing
+            violations[column, "not_integer"] = ~missing & (np.isnan(numbers) | (np.mod(numbers, 1) != 0))
+        with np.errstate(invalid="ignore"):
+            violations[column, "out_of_bounds"] = (numbers < low) | (numbers > high)
+    for column, levels in schema["categorical"].items():
+        values = student_performance_factors[column]
+        if column not in schema["optional"]:
+            violations[column, "missing"] = values.isna().to_numpy()
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Read as categorical (see the load arguments of the raw chunks), only the distinct values are compared
+            unknown = ~values.cat.categories.isin(levels)
+            codes = values.cat.codes.to_numpy()
+            violations[column, "unknown_level"] = (codes >= 0) & unknown[codes] if unknown.any() else np.zeros(len(values), dtype=bool)
+        else:
+            violations[column, "unknown_level"] = values.notna().to_numpy() & ~values.isin(levels).to_numpy()
+
+    return {key: violating for key, violating in violations.items() if violating.any()}
+
+_NUM_VIOLATION_EXAMPLES = 5
+
+def _violations_report(counts: dict[tuple[str, str], int], examples: dict[tuple[str, str], list], num_rows: int, num_quarantined: int) -> pd.DataFrame:
+    report = pd.DataFrame(
+        [
+            {"column": column, "rule": rule, "violations": count, "examples": ", ".join(map(str, examples[column, rule]))}
+            for (column, rule), count in counts.items()
+        ] + [{"column": "total", "rule": "quarantined_rows", "violations": num_quarantined, "examples": ""}],
+        columns=["column", "rule", "violations", "examples"],
+    )
+    report.insert(3, "fraction", report["violations"] / max(num_rows, 1))
+    return report
+
+def clean_student_performance_factors(student_performance_factors: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """Cleans the data by removing missing values -> because it does not make sense to synthesize them.
+    The cleaning rules only look at single rows, so they can be applied to every chunk of the data independently.
+
+    Args:
+        student_performance_factors: Validated raw data.
+        schema: The column schema with the optional columns, which are the only ones that can still have missing values.
     Returns:
         Preprocessed data, without rows with missing values.
     """
-    student_performance_factors.dropna(subset=["Parental_Education_Level", "Teacher_Quality", "Distance_from_Home"], inplace=True)
-    return student_performance_factors
+    return student_performance_factors.dropna(subset=schema["optional"])
 
-def generate_heatmap(student_performance_factors: pd.DataFrame):
+def encode_student_performance_factors(student_performance_factors: Iterable[pd.DataFrame], schema: dict) -> Iterator[tuple[pd.DataFrame, pd.DataFrame]]:
     """
-    Generates a heatmap showing the correlation between all numerical features,
-    and saves the plot as an image.
+    Encodes the preprocessed data chunk by chunk into compact dtypes. The categories and numeric
+    dtypes are fixed by the schema, so all chunks get the same dtypes.
+
+    Args:
+        student_performance_factors: Chunks of the preprocessed data.
+        schema: The column schema with the ordered levels of every categorical column
+            and the bounds of every numeric column.
+
+    Yields:
+        Chunks of the encoded data and the memory report of all chunks encoded so far.
+    """
+    memory_report = None
+    for chunk in student_performance_factors:
+        encoded = downcast_numeric_columns(encode_categorical_columns(chunk, schema), schema)
+        chunk_report = pd.DataFrame({
+            "dtype_before": chunk.dtypes.astype(str),
+            "dtype_after": encoded.dtypes.astype(str),
+            "memory_before_bytes": chunk.memory_usage(index=False, deep=True),
+            "memory_after_bytes": encoded.memory_usage(index=False, deep=True),
+        })
+        if memory_report is not None:
+            chunk_report[["memory_before_bytes", "memory_after_bytes"]] += memory_report[["memory_before_bytes", "memory_after_bytes"]]
+        memory_report = chunk_report
+        yield encoded, _memory_report_with_total(memory_report)
+
+def _memory_report_with_total(memory_report: pd.DataFrame) -> pd.DataFrame:
+    report = pd.concat([memory_report, memory_report.sum(numeric_only=True).to_frame("total").T])
+    report["saved_bytes"] = report["memory_before_bytes"] - report["memory_after_bytes"]
+    report["reduction_factor"] = (report["memory_before_bytes"] / report["memory_after_bytes"]).round(1)
+    return report.rename_axis("column").reset_index()
+
+def downcast_numeric_columns(student_performance_factors: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """
+    Stores the integer columns declared in the schema in the narrowest integer dtype that holds their
+    declared bounds, e.g. int8 instead of int64 for scores from 0 to 100. The dtype only depends on the
+    schema, so it is the same for every chunk, and the values are checked against the bounds first,
+    so the conversion never overflows.
+
+    Args:
+        student_performance_factors: Data with the numeric columns.
+        schema: The column schema with the bounds of every numeric column.
+
+    Returns:
+        Data with downcast numeric columns.
+    """
+    downcast_columns = {}
+    for column, (low, high) in schema["numeric"].items():
+        values = student_performance_factors[column]
+        if values.isna().any():
+            raise ValueError(f"Column '{column}' has missing values, which an integer column cannot hold")
+        out_of_bounds = (values < low) | (values > high)
+        if out_of_bounds.any():
+            raise ValueError(f"Column '{column}' has values outside of its declared bounds [{low}, {high}]: {sorted(values[out_of_bounds].unique())}")
+        downcast_columns[column] = values.astype(_narrowest_integer_dtype(low, high))
+
+    return student_performance_factors.assign(**downcast_columns)
+
+def _narrowest_integer_dtype(low: int, high: int) -> np.dtype:
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"The bounds [{low}, {high}] do not fit into a 64-bit integer")
+
+def encode_categorical_columns(student_performance_factors: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """
+    Converts the string columns declared in the schema once to ordered categoricals. Their values are
+    stored as int8 codes in the order of the declared levels, so every downstream stage works on the
+    codes instead of the strings.
 
     Args:
         student_performance_factors: Preprocessed data.
+        schema: The column schema with the ordered levels of every categorical column.
+
+    Returns:
+        Encoded data with ordered categorical columns.
+    """
+    encoded_columns = {}
+    for column, levels in schema["categorical"].items():
+        values = student_performance_factors[column]
+        encoded = values.astype(pd.CategoricalDtype(levels, ordered=True))
+        unknown = encoded.isna() & values.notna()
+        if unknown.any():
+            raise ValueError(f"Column '{column}' has values that are not declared in the schema: {sorted(values[unknown].unique())}")
+        encoded_columns[column] = encoded
+
+    return student_performance_factors.assign(**encoded_columns)
+
+def categorical_codes(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Replaces the ordered categorical columns by their codes, so they can be used as numeric columns.
+    """
+    ordered_columns = [column for column, dtype in data.dtypes.items() if isinstance(dtype, pd.CategoricalDtype) and dtype.ordered]
+    return data.assign(**{column: data[column].cat.codes.where(data[column].notna()) for column in ordered_columns})
+
+def compute_correlation_statistics(student_performance_factors: Iterable[pd.DataFrame], statistics: dict) -> dict:
+    """
+    Computes the sufficient statistics of the pairwise Pearson correlations of all numeric and
+    ordered categorical columns in one pass over the chunks. The chunks are processed in parallel
+    threads (the matrix products release the GIL) and their statistics are summed up, so the
+    correlation matrix of any number of rows is derived from them in milliseconds.
+
+    Args:
+        student_performance_factors: Chunks of the encoded data.
+        statistics: The parameters of the statistics computation.
+
+    Returns:
+        The correlation statistics.
+    """
+    chunks = iter(student_performance_factors)
+    first_chunk = next(chunks)
+    columns = _correlation_columns(first_chunk)
+    categorical_columns = [column for column in columns if isinstance(first_chunk[column].dtype, pd.CategoricalDtype)]
+    # Shifting the values by a typical value keeps the sums of squares small and the differences exact
+    shift = categorical_codes(first_chunk[columns]).astype(float).mean().fillna(0.0).to_numpy()
+    return update_correlation_statistics(
+        _empty_correlation_statistics(columns, categorical_columns, shift),
+        itertools.chain([first_chunk], chunks),
+        statistics["num_workers"],
+    )
+
+def update_correlation_statistics(correlation_statistics: dict, student_performance_factors: Iterable[pd.DataFrame], num_workers="auto") -> dict:
+    """
+    Adds the rows of new chunks to existing correlation statistics without rescanning the rows they
+    already contain.
+
+    Args:
+        correlation_statistics: The current correlation statistics.
+        student_performance_factors: Chunks of new encoded rows.
+        num_workers: Number of threads processing chunks, "auto" uses one per CPU.
+
+    Returns:
+        The updated correlation statistics.
+    """
+    if num_workers == "auto":
+        num_workers = os.cpu_count()
+    columns = correlation_statistics["columns"]
+    shift = np.asarray(correlation_statistics["shift"])
+
+    with ThreadPoolExecutor(max_workers=int(num_workers)) as executor:
+        # Only a bounded number of chunks is in flight, so the memory use stays flat
+        pending = deque()
+        for chunk in student_performance_factors:
+            pending.append(executor.submit(_chunk_correlation_statistics, chunk[columns], shift))
+            if len(pending) > 2 * int(num_workers):
+                correlation_statistics = merge_correlation_statistics(correlation_statistics, pending.popleft().result())
+        for future in pending:
+            correlation_statistics = merge_correlation_statistics(correlation_statistics, future.result())
+
+    return correlation_statistics
+
+def merge_correlation_statistics(left: dict, right: dict) -> dict:
+    """
+    Merges the correlation statistics of two disjoint sets of rows.
+    """
+    if left["columns"] != right["columns"] or not np.allclose(left["shift"], right["shift"]):
+        raise ValueError("Only correlation statistics of the same columns and shift can be merged.")
+    return {
+        **left,
+        **{key: (np.asarray(left[key]) + np.asarray(right[key])).tolist() for key in _CORRELATION_SUMS},
+    }
+
+def correlation_matrix(correlation_statistics: dict, include_categorical: bool = True) -> pd.DataFrame:
+    """
+    Derives the pairwise Pearson correlation matrix, equal to `DataFrame.corr()`, from the correlation statistics.
+
+    Args:
+        correlation_statistics: The correlation statistics.
+        include_categorical: Whether the ordered categorical columns are included.
+
+    Returns:
+        The correlation matrix.
+    """
+    columns = correlation_statistics["columns"]
+    count, sums, sum_squares, cross_products = (np.asarray(correlation_statistics[key]) for key in _CORRELATION_SUMS)
+    # sums[i, j] is the sum of column i over the rows where column j is present as well
+    covariance = count * cross_products - sums * sums.T
+    variance = count * sum_squares - sums**2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = covariance / np.sqrt(variance * variance.T)
+    correlation = pd.DataFrame(np.clip(correlation, -1.0, 1.0), index=columns, columns=columns)
+
+    if not include_categorical:
+        numeric_columns = [column for column in columns if column not in correlation_statistics["categorical_columns"]]
+        correlation = correlation.loc[numeric_columns, numeric_columns]
+    return correlation
+
+_CORRELATION_SUMS = ("count", "sum", "sum_squares", "cross_products")
+
+def _correlation_columns(data: pd.DataFrame) -> list[str]:
+    return [
+        column for column, dtype in data.dtypes.items()
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        or isinstance(dtype, pd.CategoricalDtype) and dtype.ordered
+    ]
+
+def _empty_correlation_statistics(columns: list[str], categorical_columns: list[str], shift: np.ndarray) -> dict:
+    zeros = np.zeros((len(columns), len(columns))).tolist()
+    return {
+        "columns": columns,
+        "categorical_columns": categorical_columns,
+        "shift": shift.tolist(),
+        **{key: zeros for key in _CORRELATION_SUMS},
+    }
+
+def _chunk_correlation_statistics(chunk: pd.DataFrame, shift: np.ndarray) -> dict:
+    values = categorical_codes(chunk).to_numpy(dtype=float) - shift
+    present = ~np.isnan(values)
+    values = np.where(present, values, 0.0)
+    present = present.astype(float)
+    return {
+        "columns": list(chunk.columns),
+        "shift": shift.tolist(),
+        "count": present.T @ present,
+        "sum": values.T @ present,
+        "sum_squares": (values**2).T @ present,
+        "cross_products": values.T @ values,
+    }
+
+def generate_reporting_plots(student_performance_factors: pd.DataFrame, correlation_statistics: dict, reporting: dict) -> dict[str, bytes]:
+    """
+    Renders the plots of the statistical analysis concurrently.
+
+    Args:
+        student_performance_factors: Encoded data.
+        correlation_statistics: The correlation statistics of the encoded data.
+        reporting: The reporting parameters.
+
+    Returns:
+        The PNG image of every plot.
+    """
+    # Every worker only gets the data its plot needs
+    max_scatter_points = reporting["max_scatter_points"]
+    return render_figures(
+        {
+            "heatmap": (generate_heatmap, (correlation_matrix(correlation_statistics, include_categorical=False),)),
+            "heatmap_encoded": (generate_heatmap_encoded, (correlation_matrix(correlation_statistics),)),
+            "attendance_exam_corr_plot": (generate_correlation_plot_attendance, (student_performance_factors[["Attendance", "Exam_Score"]], max_scatter_points)),
+            "hours_studied_exam_corr_plot": (generate_correlation_plot_hours_studied, (student_performance_factors[["Hours_Studied", "Exam_Score"]], max_scatter_points)),
+        },
+        num_workers=reporting["num_workers"],
+        dpi=reporting["dpi"],
+    )
+
+def generate_heatmap(correlation: pd.DataFrame) -> Figure:
+    """
+    Generates a heatmap showing the correlation between all numerical features.
+
+    Args:
+        correlation: Correlation matrix of the numerical features.
 
     Returns:
         The Matplotlib figure.
     """
-    import matplotlib.pyplot as plt
     import seaborn as sns
+    from matplotlib.figure import Figure
 
-    # Select only numeric columns
-    numeric_data = student_performance_factors.select_dtypes(include=["number"])
-       
-    # Compute correlation matrix and plot the heatmap
-    plt.figure(figsize=(10,8))
-    sns.heatmap(numeric_data.corr(), annot=True, cmap='coolwarm')
-    plt.title('Correlation Heatmap')
-    plt.tight_layout()
+    # Plot the heatmap of the correlation matrix
+    fig = Figure(figsize=(10,8))
+    ax = fig.subplots()
+    sns.heatmap(correlation, annot=True, cmap='coolwarm', ax=ax)
+    ax.set_title('Correlation Heatmap')
+    fig.tight_layout()
 
-    return plt
+    return fig
 
 
-def generate_correlation_plot_attendance(student_performance_factors: pd.DataFrame):
+def generate_correlation_plot_attendance(student_performance_factors: pd.DataFrame, max_scatter_points: int) -> Figure:
     """
-    Generates a correlation plot for attendance and exam score,
-    and saves the combined figure as an image.
+    Generates a correlation plot for attendance and exam score.
+    Above `max_scatter_points` rows the density is plotted as hexbins instead of single points.
 
     Args:
-        student_performance_factors: Preprocessed data.
+        student_performance_factors: Encoded data.
+        max_scatter_points: Maximum number of rows drawn as a scatter plot.
 
     Returns:
         The Matplotlib figure.
     """
-    import matplotlib.pyplot as plt
-    import seaborn as sns
+    from matplotlib.figure import Figure
 
-    plt.figure(figsize=(8, 6))
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
     
     # Scatter plot
-    sns.scatterplot(
+    scatter_or_hexbin(
+        fig,
+        ax,
         x=student_performance_factors["Attendance"],
-        y=student_performance_factors["Exam_Score"]
+        y=student_performance_factors["Exam_Score"],
+        max_scatter_points=max_scatter_points,
     )
 
-    plt.title(f'Scatter plot of exam_score and attendance')
-    plt.xlabel('Attendance')
-    plt.ylabel('Exam Score')
-    plt.tight_layout()
+    ax.set_title(f'Scatter plot of exam_score and attendance')
+    ax.set_xlabel('Attendance')
+    ax.set_ylabel('Exam Score')
+    fig.tight_layout()
     
-    return plt
+    return fig
 
 
-def generate_correlation_plot_hours_studied(student_performance_factors: pd.DataFrame):
+def generate_correlation_plot_hours_studied(student_performance_factors: pd.DataFrame, max_scatter_points: int) -> Figure:
     """
-    Generates a correlation plot for hours studied and exam score,
-    and saves the combined figure as an image.
+    Generates a correlation plot for hours studied and exam score.
+    Above `max_scatter_points` rows the density is plotted as hexbins instead of single points.
 
     Args:
-        student_performance_factors: Preprocessed data.
+        student_performance_factors: Encoded data.
+        max_scatter_points: Maximum number of rows drawn as a scatter plot.
 
     Returns:
         The Matplotlib figure.
     """
-    import matplotlib.pyplot as plt
-    import seaborn as sns
+    from matplotlib.figure import Figure
 
-    plt.figure(figsize=(8, 6))
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
     
     # Scatter plot
-    sns.scatterplot(
+    scatter_or_hexbin(
+        fig,
+        ax,
         x=student_performance_factors["Hours_Studied"],
-        y=student_performance_factors["Exam_Score"]
+        y=student_performance_factors["Exam_Score"],
+        max_scatter_points=max_scatter_points,
     )
     
-    plt.title(f'Scatter plot of exam_score and attendance')
-    plt.xlabel('Hours_Studied')
-    plt.ylabel('Exam Score')
-    plt.tight_layout()
+    ax.set_title(f'Scatter plot of exam_score and attendance')
+    ax.set_xlabel('Hours_Studied')
+    ax.set_ylabel('Exam Score')
+    fig.tight_layout()
 
-    return plt
+    return fig
 
 
-def generate_heatmap_encoded(student_performance_factors: pd.DataFrame):
+def generate_heatmap_encoded(correlation: pd.DataFrame) -> Figure:
     """
     Generates a heatmap showing the correlation between all numerical features including encoded
-    categorical columns, and saves the combined figure as an image.
+    categorical columns.
 
     Args:
-        student_performance_factors: Preprocessed data.
+        correlation: Correlation matrix of the numerical and the encoded categorical features.
 
     Returns:
         The Matplotlib figure.
     """
-    import matplotlib.pyplot as plt
     import seaborn as sns
+    from matplotlib.figure import Figure
 
-    # Encode categorical columns
-    def encode_categorical_columns(student_performance_factors):
-        custom_encodings = {
-            'Parental_Involvement': ['Low', 'Medium', 'High'],
-            'Access_to_Resources': ['Low', 'Medium', 'High'],
-            'Extracurricular_Activities': ['No', 'Yes'],
-            'Motivation_Level': ['Low', 'Medium', 'High'],
-            'Internet_Access': ['No', 'Yes'],
-            'Family_Income': ['Low', 'Medium', 'High'],
-            'School_Type': ['Public', 'Private'],
-            'Peer_Influence': ['Negative', 'Neutral', 'Positive'],
-            'Learning_Disabilities': ['No', 'Yes'],
-            'Gender': ['Female', 'Male'],
-        }
-        encoded_data = student_performance_factors.copy()
-        for column, mapping in custom_encodings.items():
-            if column in encoded_data.columns:
-                encoded_data[column] = encoded_data[column].map({val: idx for idx, val in enumerate(mapping)})
-        return encoded_data
-
-    encoded_data = encode_categorical_columns(student_performance_factors)
-
-    # Select numeric columns and compute correlation matrix
-    numeric_data = encoded_data.select_dtypes(include=["number"])
-
-    # Compute correlation matrix and plot the heatmap
-    plt.figure(figsize=(10,8))
-    sns.heatmap(numeric_data.corr(), annot=True, cmap='coolwarm', fmt=".2f", square=True, cbar_kws={"shrink": .8})
-    plt.title('Correlation Heatmap with encoded categorical and bool variables')
-    plt.tight_layout()
+    # Plot the heatmap of the correlation matrix
+    fig = Figure(figsize=(10,8))
+    ax = fig.subplots()
+    sns.heatmap(correlation, annot=True, cmap='coolwarm', fmt=".2f", square=True, cbar_kws={"shrink": .8}, ax=ax)
+    ax.set_title('Correlation Heatmap with encoded categorical and bool variables')
+    fig.tight_layout()
     
-    return plt
+    return fig
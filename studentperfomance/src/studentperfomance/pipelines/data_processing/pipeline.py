@@ -1,10 +1,9 @@
 from kedro.pipeline import Pipeline, node
 from .nodes import (
     preprocess_student_performance_factors,
-    generate_heatmap,
-    generate_heatmap_encoded,
-    generate_correlation_plot_attendance,
-    generate_correlation_plot_hours_studied,
+    encode_student_performance_factors,
+    compute_correlation_statistics,
+    generate_reporting_plots,
 )
 
 
@@ -13,33 +12,32 @@ def create_pipeline(**kwargs) -> Pipeline:
         [
             node(
                 func=preprocess_student_performance_factors,
-                inputs="student_performance_factors",
-                outputs="student_performance_factors_preprocessed",
+                inputs=["student_performance_factors@chunks", "params:schema", "params:validation"],
+                outputs=["student_performance_factors_preprocessed@chunks", "data_quality_report"],
                 name="preprocess_student_performance_factors_node",
             ),
             node(
-                func=generate_heatmap,
-                inputs="student_performance_factors_preprocessed",
-                outputs="heatmap",  
-                name="generate_heatmap_node",
+                func=encode_student_performance_factors,
+                inputs=["student_performance_factors_preprocessed@chunks", "params:schema"],
+                outputs=["student_performance_factors_encoded@chunks", "dtype_memory_report"],
+                name="encode_student_performance_factors_node",
             ),
             node(
-                func=generate_heatmap_encoded,
-                inputs="student_performance_factors_preprocessed",
-                outputs="heatmap_encoded",  
-                name="generate_heatmap_encoded_node",
+                func=compute_correlation_statistics,
+                inputs=["student_performance_factors_encoded@chunks", "params:statistics"],
+                outputs="correlation_statistics",
+                name="compute_correlation_statistics_node",
             ),
             node(
-                func=generate_correlation_plot_attendance,
-                inputs="student_performance_factors_preprocessed",
-                outputs="attendance_exam_corr_plot",  
-                name="generate_correlation_plot_attendance_node",
-            ),
-            node(
-                func=generate_correlation_plot_hours_studied,
-                inputs="student_performance_factors_preprocessed",
-                outputs="hours_studied_exam_corr_plot",
-                name="generate_correlation_plot_hours_studied_node",
+                func=generate_reporting_plots,
+                inputs=["student_performance_factors_encoded@pandas", "correlation_statistics", "params:reporting"],
+                outputs=dict(
+                    heatmap="heatmap",
+                    heatmap_encoded="heatmap_encoded",
+                    attendance_exam_corr_plot="attendance_exam_corr_plot",
+                    hours_studied_exam_corr_plot="hours_studied_exam_corr_plot",
+                ),
+                name="generate_reporting_plots_node",
             ),
         ]
     )
@@ -1,7 +1,7 @@
 """Complete reporting pipeline for the spaceflights tutorial"""
 
-from .pipeline import create_pipeline
+from .pipeline import create_cv_pipeline, create_pipeline
 
-__all__ = ["create_pipeline"]
+__all__ = ["create_cv_pipeline", "create_pipeline"]
 
 __version__ = "0.1"
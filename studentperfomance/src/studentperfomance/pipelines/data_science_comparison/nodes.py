@@ -1,44 +1,277 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import pickle
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
 import pandas as pd
-from sklearn.metrics import accuracy_score
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-def calculate_accuracies(model_1_predictions: pd.DataFrame, 
-                         model_2_predictions: pd.DataFrame, 
-                         model_3_predictions: pd.DataFrame) -> pd.DataFrame:
+from studentperfomance.reporting import render_figures
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+logger = logging.getLogger(__name__)
+
+def calculate_accuracies(predictions: pd.DataFrame, evaluation: dict) -> pd.DataFrame:
+    """
+    Evaluates the predictions of any number of models on the test_data in one vectorized pass.
+
+    The prediction columns of all models are stacked into one array, so every metric is computed for all models
+    at once: the accuracy (exact score), MAE, RMSE, R² and the share of predictions within k points of the
+    actual score. The confidence intervals come from bootstrap resamples of the test data that are drawn
+    and evaluated in batches.
+
+    Args:
+        predictions: The test data with `Actual_Score` and the predictions of every model in `Pred_Score_<model name>`.
+        evaluation: The evaluation parameters.
+
+    Returns:
+        One row per model with the metrics and their confidence intervals.
+    """
+    models = [column.removeprefix("Pred_Score_") for column in predictions.columns if column.startswith("Pred_Score_")]
+    if not models:
+        raise ValueError("The predictions have no `Pred_Score_<model name>` columns.")
+
+    predicted = predictions[[f"Pred_Score_{model}" for model in models]].to_numpy(dtype=float).T
+    actual = np.broadcast_to(predictions["Actual_Score"].to_numpy(dtype=float), predicted.shape)
+    within_k = evaluation["within_k"]
+
+    metrics = _regression_metrics(predicted[:, None, :], actual[:, None, :], within_k)
+    result = pd.DataFrame({name: values[:, 0] for name, values in metrics.items()})
+
+    bootstrap = evaluation["bootstrap"]
+    if bootstrap["num_resamples"]:
+        resampled = _bootstrap_regression_metrics(predicted, actual, within_k, bootstrap)
+        alpha = (1 - bootstrap["confidence_level"]) / 2
+        for name, values in resampled.items():
+            result[f"{name}_ci_low"], result[f"{name}_ci_high"] = np.quantile(values, [alpha, 1 - alpha], axis=1)
+
+    model_names = evaluation["model_names"]
+    result.insert(0, "Model", [model_names.get(model, model) for model in models])
+    return result
+
+def _regression_metrics(predicted: np.ndarray, actual: np.ndarray, within_k: list[int]) -> dict[str, np.ndarray]:
     """
-    Calculates the accuarcy of each model based on the predictions on the test_data.
+    Computes the metrics over the last axis of `(models, samples, rows)` arrays.
     """
-    accuracies = {
-        "Model": [],
-        "Accuracy": []
+    absolute_errors = np.abs(predicted - actual)
+    squared_error_sum = np.square(predicted - actual).sum(axis=-1)
+    total_sum_of_squares = np.square(actual - actual.mean(axis=-1, keepdims=True)).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = 1 - squared_error_sum / total_sum_of_squares
+
+    metrics = {
+        "Accuracy": (absolute_errors < 0.5).mean(axis=-1),
+        "MAE": absolute_errors.mean(axis=-1),
+        "RMSE": np.sqrt(squared_error_sum / actual.shape[-1]),
+        "R2": r2,
     }
-    
-    for i, (predictions, model_name) in enumerate(zip(
-        [model_1_predictions, model_2_predictions, model_3_predictions],
-        ["Tabular Predictor", "Tabular Predictor NN", "Mutli Modal"]
-    )):
-        acc = accuracy_score(predictions["Actual_Score"], predictions["Pred_Score"])
-        accuracies["Model"].append(model_name)
-        accuracies["Accuracy"].append(acc)
-    
-    return pd.DataFrame(accuracies)
+    for k in within_k:
+        metrics[f"Within_{k}"] = (absolute_errors <= k).mean(axis=-1)
+    return metrics
+
+def _bootstrap_regression_metrics(predicted: np.ndarray, actual: np.ndarray, within_k: list[int], bootstrap: dict) -> dict[str, np.ndarray]:
+    """
+    Computes the metrics of every model on `num_resamples` bootstrap resamples of the rows,
+    `batch_size` resamples at a time so the memory stays bounded for large test data.
+    """
+    rng = np.random.default_rng(bootstrap["random_state"])
+    num_rows = predicted.shape[1]
+    batches = []
+    for start in range(0, bootstrap["num_resamples"], bootstrap["batch_size"]):
+        size = min(bootstrap["batch_size"], bootstrap["num_resamples"] - start)
+        rows = rng.integers(0, num_rows, size=(size, num_rows))
+        batches.append(_regression_metrics(predicted[:, rows], actual[:, rows], within_k))
+    return {name: np.concatenate([batch[name] for batch in batches], axis=1) for name in batches[0]}
+
+def cross_validate_models(data: pd.DataFrame, label_column: str, training: dict, evaluation: dict, cross_validation: dict) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Evaluates the models by k-fold cross-validation instead of the single test split.
+
+    Every row is assigned to a fold by the hash of its key with the seed, so the folds are the same in every
+    run and rows appended to the data later do not move the existing rows to other folds. For every model and
+    fold, the model is trained on the other folds and scored on the fold. The fold trainings run in CPU-only
+    worker processes that share the `training.parallel` budget, and no fold training is started that could
+    end after the `max_hours` wall-clock budget. A trained fold model is cached by the fingerprint of its
+    trainer, its training parameters and its training rows, so a later run only trains the folds that changed.
+
+    Args:
+        data: The encoded dataset with the labels.
+        label_column: The name of the target column.
+        training: The training parameters, `time_limit` is replaced by the one of `cross_validation`.
+        evaluation: The evaluation parameters.
+        cross_validation: The cross-validation parameters.
+
+    Returns:
+        The metrics of every model and fold and the mean and variance of every metric per model.
+    """
+    from studentperfomance.pipelines.data_science_prep.nodes import _unit_hash
+    from studentperfomance.pipelines.data_science_training.nodes import TRAINERS, _parallel_resources
+
+    key = data if cross_validation["key_columns"] is None else data[cross_validation["key_columns"]]
+    folds = np.floor(_unit_hash(key, cross_validation["seed"]) * cross_validation["num_folds"]).astype(int)
+    logger.info("Fold sizes: %s", np.bincount(folds, minlength=cross_validation["num_folds"]).tolist())
+
+    fold_training = {**training, "time_limit": cross_validation["time_limit"]}
+    resources = _parallel_resources(training, num_trainers=cross_validation["num_workers"])
+    cache_dir = Path(cross_validation["cache_dir"])
+    pending = []
+    # Fold by fold, so a budget that ends early still leaves all models with the same folds
+    for fold in range(cross_validation["num_folds"]):
+        fit_data = data[folds != fold]
+        for model, trainer_name in cross_validation["models"].items():
+            cache_path = cache_dir / _fold_model_fingerprint(trainer_name, label_column, fold_training, fit_data)
+            pending.append((model, fold, trainer_name, cache_path))
+    # The cached folds are scored first, they are not limited by the budget
+    pending.sort(key=lambda job: not (job[3] / "model.joblib").exists())
+
+    deadline = time.monotonic() + cross_validation["max_hours"] * 3600
+    results = []
+    running = {}
+    # Spawned workers do not inherit the thread pools of torch and friends from this process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=cross_validation["num_workers"], mp_context=context) as executor:
+        while pending or running:
+            while pending and len(running) < cross_validation["num_workers"]:
+                model, fold, trainer_name, cache_path = pending[0]
+                cached = (cache_path / "model.joblib").exists()
+                if not cached and time.monotonic() + fold_training["time_limit"] > deadline:
+                    break
+                try:
+                    future = executor.submit(
+                        _cross_validation_fold, TRAINERS[trainer_name], data[folds != fold], data[folds == fold],
+                        label_column, fold_training, resources, cache_path, evaluation["within_k"],
+                    )
+                except BrokenProcessPool as error:
+                    # A crashed worker breaks the pool, the folds that did not start can't run anymore
+                    logger.warning("The worker pool broke, %d folds are not run: %s", len(pending), error)
+                    results += [{"model": model, "fold": fold, "status": "failed"} for model, fold, _, _ in pending]
+                    pending = []
+                    break
+                pending.pop(0)
+                running[future] = (model, fold, cached)
+
+            if not running:
+                results += [{"model": model, "fold": fold, "status": "skipped_budget"} for model, fold, _, _ in pending]
+                pending = []
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                model, fold, cached = running.pop(future)
+                try:
+                    metrics, duration_s = future.result()
+                except Exception as error:  # a failing fold must not end the evaluation of the others
+                    logger.warning("Fold %d of model '%s' failed: %s", fold, model, error)
+                    results.append({"model": model, "fold": fold, "status": "failed"})
+                    continue
+                results.append({"model": model, "fold": fold, "status": "completed", "cached": cached, "duration_s": duration_s, **metrics})
+                logger.info("Fold %d of model '%s': %s", fold, model, metrics)
+
+    fold_metrics = pd.DataFrame(results).sort_values(["model", "fold"], ignore_index=True)
+    if not (fold_metrics["status"] == "completed").any():
+        raise RuntimeError(f"No fold of the cross-validation completed, the statuses are {fold_metrics['status'].value_counts().to_dict()}")
+    return fold_metrics, _cross_validation_summary(fold_metrics, list(cross_validation["models"]), evaluation["model_names"])
+
+def _cross_validation_fold(trainer, fit_data: pd.DataFrame, validation_data: pd.DataFrame, label_column: str, training: dict, resources: dict, cache_path: Path, within_k: list[int]):
+    """
+    Trains a fold model or loads it from the cache and scores it on the validation fold.
+    """
+    import joblib
+
+    start = time.time()
+    model_file = cache_path / "model.joblib"
+    if model_file.exists():
+        predictor = joblib.load(model_file)
+    else:
+        predictor = trainer(fit_data, label_column, training, resources)
+        cache_path.mkdir(parents=True, exist_ok=True)
+        if hasattr(predictor, "clone"):
+            # A TabularPredictor keeps its models in its own directory, which is moved into the cache
+            trained_path = predictor.path
+            predictor = predictor.clone(path=str(cache_path / "predictor"), return_clone=True)
+            shutil.rmtree(trained_path, ignore_errors=True)
+        joblib.dump(predictor, model_file)
+
+    predicted = np.asarray(predictor.predict(validation_data.drop(columns=[label_column])), dtype=float)
+    actual = validation_data[label_column].to_numpy(dtype=float)
+    metrics = _regression_metrics(predicted[None, None, :], actual[None, None, :], within_k)
+    return {name: float(values[0, 0]) for name, values in metrics.items()}, time.time() - start
+
+def _fold_model_fingerprint(trainer_name: str, label_column: str, training: dict, fit_data: pd.DataFrame) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(json.dumps({"trainer": trainer_name, "label_column": label_column, "training": training}, sort_keys=True).encode())
+    digest.update(pd.util.hash_pandas_object(fit_data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _cross_validation_summary(fold_metrics: pd.DataFrame, models: list[str], model_names: dict) -> pd.DataFrame:
+    """
+    Aggregates the metrics of the completed folds to their mean and variance per model.
+    """
+    completed = fold_metrics[fold_metrics["status"] == "completed"]
+    metric_columns = [column for column in completed.columns if column not in ("model", "fold", "status", "cached", "duration_s")]
+    summary = completed.groupby("model")[metric_columns].agg(["mean", "var"])
+    summary.columns = [f"{metric}_{statistic}" for metric, statistic in summary.columns]
+    summary.insert(0, "Folds", completed.groupby("model").size())
+    summary = summary.reindex(models)
+    summary["Folds"] = summary["Folds"].fillna(0).astype(int)
+    summary.insert(0, "Model", [model_names.get(model, model) for model in summary.index])
+    return summary.reset_index(drop=True)
+
+def generate_comparison_plots(model_accuracies: pd.DataFrame, best_model_feature_importance: pd.DataFrame, reporting: dict) -> dict[str, bytes]:
+    """
+    Renders the plots of the model comparison concurrently.
+
+    Args:
+        model_accuracies: DataFrame containing model names and their accuracies.
+        best_model_feature_importance: Table containing the feature importance of the best model.
+        reporting: The reporting parameters.
+
+    Returns:
+        The PNG image of every plot.
+    """
+    return render_figures(
+        {
+            "accuracy_visualization": (visualize_accuracies, (model_accuracies,)),
+            "best_model_feature_importance_plot": (generate_feature_importance_plot, (best_model_feature_importance,)),
+        },
+        num_workers=reporting["num_workers"],
+        dpi=reporting["dpi"],
+    )
 
-def visualize_accuracies(model_accuracies: pd.DataFrame) -> str:
+def visualize_accuracies(model_accuracies: pd.DataFrame) -> Figure:
     """
-    Visualizes the Accuracy of each model and saves a picture
+    Visualizes the Accuracy of each model
     """
-    plt.figure(figsize=(10, 6))
-    plt.bar(model_accuracies["Model"], model_accuracies["Accuracy"])
-    plt.title("Model Accuracies")
-    plt.xlabel("Model")
-    plt.ylabel("Accuracy")
-    plt.ylim(0, 1)
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    error = None
+    if "Accuracy_ci_low" in model_accuracies:
+        error = [model_accuracies["Accuracy"] - model_accuracies["Accuracy_ci_low"], model_accuracies["Accuracy_ci_high"] - model_accuracies["Accuracy"]]
+    ax.bar(model_accuracies["Model"], model_accuracies["Accuracy"], yerr=error, capsize=6)
+    ax.set_title("Model Accuracies")
+    ax.set_xlabel("Model")
+    ax.set_ylabel("Accuracy")
+    ax.set_ylim(0, 1)
     
-    return plt
+    return fig
 
 
-def generate_best_model_visualizations(model_accuracies: pd.DataFrame, student_performance_factors_test_data: pd.DataFrame, autogluon_tabular_model, autogluon_tabular_nn_model, autogluon_multimodal_model) -> str:
+def generate_best_model_visualizations(model_accuracies: pd.DataFrame, student_performance_factors_test_data: pd.DataFrame, autogluon_tabular_model, autogluon_tabular_nn_model, autogluon_multimodal_model, feature_importance: dict) -> str:
     """
     Generates visualizations for the best model.
 
@@ -46,6 +279,7 @@ def generate_best_model_visualizations(model_accuracies: pd.DataFrame, student_p
         model_accuracies: DataFrame containing model names and their accuracies.
         models: A dictionary mapping model names to their respective objects.
         student_performance_factors_test_data: Test dataset for feature importance calculation.
+        feature_importance: Settings of the feature importance calculation.
 
     Returns:
         File path of the plot containing all useful information about the best model.
@@ -61,23 +295,32 @@ def generate_best_model_visualizations(model_accuracies: pd.DataFrame, student_p
 
 
     best_model_leaderboard = generate_leaderboard_table(autogluon_tabular_model)
-    feature_importance_table = generate_feature_importance_table(autogluon_tabular_model, student_performance_factors_test_data)
+    feature_importance_table = generate_feature_importance_table(autogluon_tabular_model, student_performance_factors_test_data, feature_importance)
 
     return best_model_leaderboard, feature_importance_table
 
-def select_best_model(model_accuracies: pd.DataFrame) -> str:
+def select_best_model(model_accuracies: pd.DataFrame, metric: str = "Accuracy") -> str:
     """
-    Selects the best model based on accuracy.
+    Selects the best model based on a metric. Of cross-validated accuracies, the mean of the
+    metric over the folds is used.
 
     Args:
-        model_accuracies: DataFrame containing model names and their accuracies.
+        model_accuracies: DataFrame containing model names and their accuracies, from
+            `calculate_accuracies` or `cross_validate_models`.
+        metric: The metric to compare, lower is better for MAE and RMSE.
 
     Returns:
         The name of the best model.
     """
-    best_model = model_accuracies.loc[model_accuracies['Accuracy'].idxmax(), 'Model']
+    column = f"{metric}_mean" if f"{metric}_mean" in model_accuracies.columns else metric
+    scores = model_accuracies[column] if metric in _LOWER_IS_BETTER else -model_accuracies[column]
+    best_model = model_accuracies.loc[scores.idxmin(), 'Model']
+    logger.info("Best model by %s: %s", column, best_model)
     return best_model
 
+# Metrics where a lower value is the better one
+_LOWER_IS_BETTER = {"MAE", "RMSE"}
+
 def generate_leaderboard_table(model) -> pd.DataFrame:
     """
     Retrieves the leaderboard.
@@ -91,37 +334,193 @@ def generate_leaderboard_table(model) -> pd.DataFrame:
     leaderboard_df = model.leaderboard()
     return leaderboard_df
 
-def generate_feature_importance_table(model, student_performance_factors_test_data: pd.DataFrame) -> pd.DataFrame:
+def generate_feature_importance_table(model, student_performance_factors_test_data: pd.DataFrame, feature_importance: dict) -> pd.DataFrame:
     """
-    Creates a table of the sorted feature importance.
+    Creates a table of the sorted permutation feature importance.
+
+    The cost is bounded: the permutations run on a subsample of the test data, the features are
+    shuffled in rounds and a feature stops being shuffled once its confidence interval is stable.
+    The features are split between parallel worker processes and the result is cached by the
+    fingerprints of the model, the test data and the settings, so it is only computed once.
 
     Args:
         model: The Tabular Predictor model object.
         student_performance_factors_test_data: Test dataset for feature importance calculation.
+        feature_importance: Settings of the feature importance calculation.
 
     Returns:
         Table containing the feature importance.
     """
-    feature_importance_df = model.feature_importance(student_performance_factors_test_data)
+    cache_file = Path(feature_importance["cache_dir"]) / f"{_feature_importance_fingerprint(model, student_performance_factors_test_data, feature_importance)}.parquet"
+    if cache_file.exists():
+        logger.info("Loading the cached feature importance from '%s'", cache_file)
+        return pd.read_parquet(cache_file)
+
+    data = student_performance_factors_test_data
+    if len(data) > feature_importance["subsample_size"]:
+        data = data.sample(n=feature_importance["subsample_size"], random_state=feature_importance["random_state"])
+
+    feature_importance_df = _feature_importance_in_rounds(model, data, feature_importance)
     feature_importance_df = feature_importance_df.reset_index()
     feature_importance_df.rename(columns={"index": "feature"}, inplace=True)
 
     importance_sorted = feature_importance_df.sort_values(by="importance", ascending=False)
 
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    importance_sorted.to_parquet(cache_file, index=False)
     return importance_sorted
 
-def generate_feature_importance_plot(feature_importance_df: pd.DataFrame):
+
+def _feature_importance_in_rounds(model, data: pd.DataFrame, feature_importance: dict) -> pd.DataFrame:
+    """
+    Shuffles every feature `shuffle_sets_per_round` times per round and merges the results of the
+    rounds, until all features are stable, `num_shuffle_sets` is reached or the time limit is over.
+    Every round shuffles with its own seeds, so the rounds are independent samples.
+    """
+    from scipy import stats
+
+    features = [feature for feature in model.original_features if feature in data.columns]
+    num_workers = feature_importance["num_workers"]
+    if num_workers == "auto":
+        num_workers = os.cpu_count()
+    num_workers = max(1, min(int(num_workers), len(features)))
+    shuffle_sets_per_round = max(2, feature_importance["shuffle_sets_per_round"])
+    num_rounds = math.ceil(feature_importance["num_shuffle_sets"] / shuffle_sets_per_round)
+    deadline = time.monotonic() + (feature_importance["time_limit"] or math.inf)
+
+    executor = None
+    if num_workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_feature_importance_worker,
+            initargs=(model.path, data),
+        )
+
+    merged = pd.DataFrame(columns=["importance", "stddev", "n"], dtype=float)
+    active = features
+    previous_half_width = pd.Series(np.inf, index=features)
+    # Quantile of the two-sided interval, like the pXX_high/pXX_low bands of AutoGluon
+    two_sided_quantile = 1 - (1 - feature_importance["confidence_level"]) / 2
+    try:
+        for round_index in range(num_rounds):
+            if not active or time.monotonic() > deadline:
+                break
+            # The shuffle sets of a call are seeded from `random_state` on, the next round starts after them
+            random_state = feature_importance["random_state"] + round_index * shuffle_sets_per_round
+            if executor is None:
+                results = [_permutation_importance(model, data, active, shuffle_sets_per_round, random_state)]
+            else:
+                groups = [group.tolist() for group in np.array_split(active, num_workers) if len(group)]
+                results = executor.map(
+                    _feature_importance_worker, groups, [shuffle_sets_per_round] * len(groups), [random_state] * len(groups),
+                )
+            merged = _merge_importance(merged, pd.concat(results))
+
+            critical_value = stats.t.ppf(two_sided_quantile, merged["n"] - 1)
+            half_width = critical_value * merged["stddev"] / np.sqrt(merged["n"])
+            stable = (half_width <= feature_importance["ci_atol"]) | (
+                (previous_half_width[merged.index] - half_width).abs() <= feature_importance["ci_rtol"] * half_width
+            )
+            previous_half_width[merged.index] = half_width
+            active = [feature for feature in active if not stable[feature]]
+            logger.info("Feature importance round done, %d of %d features not stable yet", len(active), len(features))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    standard_error = merged["stddev"] / np.sqrt(merged["n"])
+    critical_value = stats.t.ppf(two_sided_quantile, merged["n"] - 1)
+    level = round(feature_importance["confidence_level"] * 100)
+    merged["n"] = merged["n"].astype(int)
+    merged["p_value"] = stats.t.sf(merged["importance"] / standard_error, merged["n"] - 1)
+    merged[f"p{level}_high"] = merged["importance"] + critical_value * standard_error
+    merged[f"p{level}_low"] = merged["importance"] - critical_value * standard_error
+    return merged[["importance", "stddev", "p_value", "n", f"p{level}_high", f"p{level}_low"]]
+
+
+_worker_model = None
+_worker_data = None
+
+
+def _init_feature_importance_worker(model_path: str, data: pd.DataFrame):
+    from autogluon.tabular import TabularPredictor
+
+    global _worker_model, _worker_data
+    _worker_model = TabularPredictor.load(model_path)
+    _worker_data = data
+
+
+def _feature_importance_worker(features: list[str], num_shuffle_sets: int, random_state: int) -> pd.DataFrame:
+    return _permutation_importance(_worker_model, _worker_data, features, num_shuffle_sets, random_state)
+
+
+def _permutation_importance(model, data: pd.DataFrame, features: list[str], num_shuffle_sets: int, random_state: int) -> pd.DataFrame:
+    """
+    `TabularPredictor.feature_importance` always seeds its shuffles with 0, so the permutations
+    are computed by AutoGluon's function behind it, which takes the seed.
+    """
+    from autogluon.core.utils.utils import compute_permutation_feature_importance
+
+    return compute_permutation_feature_importance(
+        X=data.drop(columns=[model.label]),
+        y=data[model.label],
+        predict_func=model.predict,
+        eval_metric=model.eval_metric,
+        features=features,
+        subsample_size=len(data),
+        num_shuffle_sets=num_shuffle_sets,
+        silent=True,
+        random_state=random_state,
+    )[["importance", "stddev", "n"]]
+
+
+def _merge_importance(merged: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pools the mean and the standard deviation of the shuffles of two rounds per feature.
+    """
+    if merged.empty:
+        return new.astype(float)
+
+    # Only features of the first round are shuffled again, so they all have previous results
+    previous = merged.loc[new.index]
+    n = previous["n"] + new["n"]
+    delta = new["importance"] - previous["importance"]
+    sum_of_squares = (
+        (previous["n"] - 1) * previous["stddev"] ** 2
+        + (new["n"] - 1) * new["stddev"] ** 2
+        + previous["n"] * new["n"] / n * delta**2
+    )
+    merged = merged.copy()
+    merged.loc[new.index, "importance"] = previous["importance"] + delta * new["n"] / n
+    merged.loc[new.index, "stddev"] = np.sqrt(sum_of_squares / (n - 1))
+    merged.loc[new.index, "n"] = n
+    return merged
+
+
+def _feature_importance_fingerprint(model, test_data: pd.DataFrame, feature_importance: dict) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+    digest.update(pd.util.hash_pandas_object(test_data).to_numpy().tobytes())
+    settings = {key: value for key, value in feature_importance.items() if key not in ("cache_dir", "num_workers")}
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def generate_feature_importance_plot(feature_importance_df: pd.DataFrame) -> Figure:
     """
     Creates a plot of the sorted feature importance.
 
     Args:
-        model: The Tabular Predictor model object.
-        student_performance_factors_test_data: Test dataset for feature importance calculation.
+        feature_importance_df: Table containing the feature importance.
 
     Returns:
         Matplotlib figure containing the sorted feature importance plot.
     """
-    fig, ax = plt.subplots(figsize=(14, 10))
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(14, 10))
+    ax = fig.subplots()
     sns.barplot(
         x=feature_importance_df["importance"],
         y=feature_importance_df["feature"],
@@ -132,7 +531,7 @@ def generate_feature_importance_plot(feature_importance_df: pd.DataFrame):
     ax.set_xlabel("Importance", fontsize=12)
     ax.set_ylabel("Feature", fontsize=12)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     return fig
 
@@ -1,32 +1,56 @@
 from kedro.pipeline import Pipeline, node
-from .nodes import calculate_accuracies, visualize_accuracies, generate_best_model_visualizations, generate_feature_importance_plot
+from .nodes import calculate_accuracies, cross_validate_models, generate_best_model_visualizations, generate_comparison_plots, select_best_model
 
 def create_pipeline(**kwargs):
     return Pipeline(
         [
             node(
                 func=calculate_accuracies,
-                inputs=["autogluon_tabular_predictions", "autogluon_tabular_nn_predictions", "autogluon_multimodal_predictions"],
+                inputs=["autogluon_predictions@pandas", "params:evaluation"],
                 outputs="model_accuracies",
                 name="calculate_accuracies_node",
             ),
-            node(
-                func=visualize_accuracies,
-                inputs="model_accuracies",
-                outputs="accuracy_visualization",
-                name="visualize_accuracies_node",
-            ),
             node(
                 func=generate_best_model_visualizations,
-                inputs=["model_accuracies", "student_performance_factors_test_data", "autogluon_tabular_model", "autogluon_tabular_nn_model", "autogluon_multimodal_model"],
+                inputs=["model_accuracies", "student_performance_factors_test_data@pandas", "autogluon_tabular_model", "autogluon_tabular_nn_model", "autogluon_multimodal_model", "params:feature_importance"],
                 outputs=["best_model_leaderboard", "best_model_feature_importance"],
                 name="generate_best_model_visualizations_node",
             ),
             node(
-                func=generate_feature_importance_plot,
-                inputs="best_model_feature_importance",
-                outputs="best_model_feature_importance_plot",
-                name="generate_feature_importance_plot_node",
+                func=generate_comparison_plots,
+                inputs=["model_accuracies", "best_model_feature_importance", "params:reporting"],
+                outputs=dict(
+                    accuracy_visualization="accuracy_visualization",
+                    best_model_feature_importance_plot="best_model_feature_importance_plot",
+                ),
+                name="generate_comparison_plots_node",
+            ),
+        ]
+    )
+
+
+def create_cv_pipeline(**kwargs):
+    """Compares the models by k-fold cross-validation instead of their predictions of the test data."""
+    return Pipeline(
+        [
+            node(
+                func=cross_validate_models,
+                inputs=dict(
+                    data="student_performance_factors_encoded@pandas",
+                    label_column="params:label_column",
+                    training="params:training",
+                    evaluation="params:evaluation",
+                    cross_validation="params:cross_validation",
+                ),
+                outputs=["cv_fold_metrics", "cv_model_accuracies"],
+                name="cross_validate_models_node",
+                tags="exclusive",  # uses the whole host, see studentperfomance.runner
+            ),
+            node(
+                func=select_best_model,
+                inputs=["cv_model_accuracies", "params:cross_validation.selection_metric"],
+                outputs="cv_best_model",
+                name="select_best_model_node",
             ),
         ]
     )
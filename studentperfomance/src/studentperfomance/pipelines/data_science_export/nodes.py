@@ -0,0 +1,34 @@
+import logging
+import os
+import shutil
+
+logger = logging.getLogger(__name__)
+
+
+def export_inference_artifact(predictor, export: dict):
+    """
+    Prepares a trained TabularPredictor for the export as inference artifact. The artifact dataset
+    keeps only its best model with the feature pipeline.
+
+    With `refit_full` the bagged models of the best model are first distilled into single models
+    trained on all data, which predict several times faster but not exactly like the bagged ones.
+    They are refitted in a copy of the predictor, `<predictor path>_refit_full`.
+
+    Args:
+        predictor: The trained Tabular Predictor.
+        export: The export parameters.
+
+    Returns:
+        The predictor to export.
+    """
+    if export["refit_full"]:
+        # The refit happens in a copy, the trained predictor stays as the other pipelines use it.
+        # The copy of the previous export is replaced, so exports do not pile up copies
+        refit_path = os.path.normpath(predictor.path) + "_refit_full"
+        shutil.rmtree(refit_path, ignore_errors=True)
+        predictor = predictor.clone(path=refit_path, return_clone=True)
+        refit_models = predictor.refit_full(model="best", set_best_to_refit_full=True)
+        logger.info("Refitted the best model on all data: %s", refit_models)
+
+    logger.info("Exporting the model '%s' of '%s'", predictor.model_best, predictor.path)
+    return predictor
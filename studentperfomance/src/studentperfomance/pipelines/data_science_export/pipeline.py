@@ -0,0 +1,20 @@
+from kedro.pipeline import Pipeline, node, pipeline
+from .nodes import export_inference_artifact
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(
+                func=export_inference_artifact,
+                inputs=["autogluon_tabular_model", "params:export"],
+                outputs="autogluon_tabular_inference_artifact",
+                name="export_tabular_inference_artifact_node"
+            ),
+            node(
+                func=export_inference_artifact,
+                inputs=["autogluon_tabular_nn_model", "params:export"],
+                outputs="autogluon_tabular_nn_inference_artifact",
+                name="export_tabular_nn_inference_artifact_node"
+            ),
+        ]
+    )
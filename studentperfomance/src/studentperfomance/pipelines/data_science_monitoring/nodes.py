@@ -0,0 +1,100 @@
+import hashlib
+import logging
+from collections.abc import Iterable
+
+import pandas as pd
+
+from studentperfomance.sketches import (
+    compatible, create_sketch, kolmogorov_smirnov, merge_sketches, population_stability_index, quantile, sketch_like,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def sketch_training_data(train_data: pd.DataFrame, monitoring: dict) -> dict:
+    """
+    Creates the reference sketch of the training data, which the scored data is compared to.
+
+    Args:
+        train_data: The training dataset.
+        monitoring: The monitoring parameters.
+
+    Returns:
+        The sketch of the training data.
+    """
+    return create_sketch(train_data, monitoring["bins"])
+
+
+def sketch_predictions(predictions: Iterable[pd.DataFrame], training_sketch: dict, history: dict, label_column: str) -> tuple[dict, dict]:
+    """
+    Sketches the scored data batch by batch with the buckets of the training data and adds it to the
+    sketch of all scored data so far. The features are compared to the same column of the training
+    data, the predictions of every model and the actual scores to its label column.
+
+    A scoring run is only added to the history once, the history keeps the fingerprints of the runs it
+    holds. When the training data changed, the history starts anew with the buckets of the new training data.
+
+    Args:
+        predictions: Batches of the predictions of all models.
+        training_sketch: The sketch of the training data.
+        history: The sketch of all scored data so far.
+        label_column: The name of the target column.
+
+    Returns:
+        The sketch of this scoring run and the updated sketch of all scored data.
+    """
+    run_sketch = {"rows": 0, "columns": {}}
+    digest = hashlib.blake2b(digest_size=20)
+    for batch in predictions:
+        references = {column: label_column for column in batch.columns if column.startswith("Pred_Score_") or column == "Actual_Score"}
+        run_sketch = merge_sketches(run_sketch, sketch_like(training_sketch, batch, references))
+        digest.update(pd.util.hash_pandas_object(batch, index=False).to_numpy().tobytes())
+    run_sketch["fingerprint"] = digest.hexdigest()
+
+    if history["columns"] and not compatible(history, run_sketch):
+        logger.info("The training data changed since the last scoring run, the history of the scored data starts anew")
+        history = {"rows": 0, "columns": {}}
+    fingerprints = history.get("fingerprints", [])
+    if run_sketch["fingerprint"] in fingerprints:
+        logger.info("The scored data of run %s is already part of the history", run_sketch["fingerprint"])
+        return run_sketch, history
+    merged = merge_sketches(history, {key: value for key, value in run_sketch.items() if key != "fingerprint"})
+    return run_sketch, {**merged, "fingerprints": [*fingerprints, run_sketch["fingerprint"]]}
+
+
+def detect_drift(training_sketch: dict, scoring_sketch: dict, scoring_sketch_history: dict, monitoring: dict) -> pd.DataFrame:
+    """
+    Compares the sketches of the last scoring run and of all scored data with the training data. Only the
+    sketches are read, so the check takes the same time for any number of scored rows.
+
+    Args:
+        training_sketch: The sketch of the training data.
+        scoring_sketch: The sketch of the last scoring run.
+        scoring_sketch_history: The sketch of all scored data.
+        monitoring: The monitoring parameters.
+
+    Returns:
+        The population stability index, the Kolmogorov-Smirnov statistic and the medians of every
+        column per scope, with the columns that drifted beyond `max_psi` or `max_ks` flagged.
+    """
+    rows = []
+    for scope, sketch in (("last_run", scoring_sketch), ("history", scoring_sketch_history)):
+        for column, column_sketch in sketch["columns"].items():
+            reference = training_sketch["columns"][column_sketch["reference"]]
+            rows.append({
+                "scope": scope,
+                "column": column,
+                "reference_column": column_sketch["reference"],
+                "rows": sketch["rows"],
+                "psi": population_stability_index(reference, column_sketch),
+                "ks": kolmogorov_smirnov(reference, column_sketch),
+                "reference_median": quantile(reference, 0.5),
+                "median": quantile(column_sketch, 0.5),
+            })
+
+    report = pd.DataFrame(rows, columns=["scope", "column", "reference_column", "rows", "psi", "ks", "reference_median", "median"])
+    report["drift"] = (report["psi"] > monitoring["max_psi"]) | (report["ks"] > monitoring["max_ks"])
+    drifted = report[report["drift"]]
+    if len(drifted):
+        logger.warning("Drift of the scored data from the training data:\n%s", drifted.to_string(index=False))
+    return report
@@ -0,0 +1,27 @@
+from kedro.pipeline import Pipeline, node, pipeline
+from .nodes import detect_drift, sketch_predictions, sketch_training_data
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(
+                func=sketch_training_data,
+                inputs=["student_performance_factors_train_data@pandas", "params:monitoring"],
+                outputs="training_sketch",
+                name="sketch_training_data_node",
+            ),
+            node(
+                func=sketch_predictions,
+                inputs=["autogluon_predictions@batches", "training_sketch", "scoring_sketch_history_previous", "params:label_column"],
+                outputs=["scoring_sketch", "scoring_sketch_history"],
+                name="sketch_predictions_node",
+            ),
+            node(
+                func=detect_drift,
+                inputs=["training_sketch", "scoring_sketch", "scoring_sketch_history", "params:monitoring"],
+                outputs="drift_report",
+                name="detect_drift_node",
+            ),
+        ]
+    )
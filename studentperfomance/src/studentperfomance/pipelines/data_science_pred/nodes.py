@@ -1,5 +1,18 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+_TRAINING_FINGERPRINT_SUFFIX = "_training_fingerprint"
+
+
 def generate_predictions(predictor, test_data: pd.DataFrame, label_column: str):
     """
     Generate predictions from a trained AutoGluon model and combine with the test data
@@ -13,22 +26,103 @@ def generate_predictions(predictor, test_data: pd.DataFrame, label_column: str):
     Returns:
         pd.DataFrame: A DataFrame containing test data, actual labels, and predictions.
     """
+    _check_label_column(test_data, label_column)
+    return _predict(predictor, test_data, label_column)
+
+
+def generate_predictions_wide(test_batches: Iterator[pd.DataFrame], label_column: str, scoring: dict, **models) -> Iterator[pd.DataFrame]:
+    """
+    Generate the predictions of several trained AutoGluon models in a single pass over the test data,
+    as one table with a prediction column per model.
+
+    Tabular predictors fitted on the same training rows with the same input features share one
+    transformation of every batch, which is the costly part of a prediction for the fast models.
+    The models then predict the transformed features concurrently in threads. Every batch of results is saved before the next one is read, so the memory footprint is
+    bounded by the batch size instead of the test data size.
+
+    Args:
+        test_batches: The test dataset as an iterator of row batches.
+        label_column (str): The name of the target column.
+        scoring: The scoring parameters.
+        **models: The trained AutoGluon predictors by model name and, as `<model name>_training_fingerprint`,
+            the hashes of the rows the tabular predictors were trained on.
+
+    Yields:
+        pd.DataFrame: The batch with the actual labels in `Actual_Score` and the predictions of every model in `Pred_Score_<model name>`.
+    """
+    training_fingerprints = {
+        name.removesuffix(_TRAINING_FINGERPRINT_SUFFIX): models[name] for name in models if name.endswith(_TRAINING_FINGERPRINT_SUFFIX)
+    }
+    predictors = {name: model for name, model in models.items() if not name.endswith(_TRAINING_FINGERPRINT_SUFFIX)}
+    num_workers = scoring["num_workers"]
+    if num_workers == "auto":
+        num_workers = len(predictors)
+
+    groups = _feature_pipeline_groups(predictors, training_fingerprints)
+    logger.info("Feature pipelines shared by the models: %s", groups)
+    with ThreadPoolExecutor(max_workers=max(1, int(num_workers))) as executor:
+        for batch in test_batches:
+            _check_label_column(batch, label_column)
+            features = batch.drop(columns=[label_column])
+            futures = {}
+            for group in groups:
+                if len(group) == 1 and not hasattr(predictors[group[0]], "transform_features"):
+                    futures[group[0]] = executor.submit(predict_scores, predictors[group[0]], features)
+                    continue
+                transformed = predictors[group[0]].transform_features(features)
+                for name in group:
+                    futures[name] = executor.submit(predictors[name].predict, transformed, transform_features=False)
+
+            predictions = {f"Pred_Score_{name}": futures[name].result() for name in predictors}
+            yield batch.assign(Actual_Score=batch[label_column], **predictions)
+
+
+def _feature_pipeline_groups(predictors: dict, training_fingerprints: dict[str, pd.DataFrame]) -> list[list[str]]:
+    """
+    Groups the predictors by their feature pipeline. The feature generator of AutoGluon learns its state
+    (category mappings, value ranges) deterministically from the training data, so two tabular predictors
+    fitted on the same rows with the same input features and feature types transform any data identically.
+    Other predictors, and tabular predictors without a training fingerprint, are in a group of their own.
+    """
+    groups: dict = {}
+    for name, predictor in predictors.items():
+        key = _feature_pipeline_key(predictor, training_fingerprints.get(name))
+        groups.setdefault(name if key is None else key, []).append(name)
+    return list(groups.values())
+
+
+def _feature_pipeline_key(predictor, training_fingerprint: pd.DataFrame | None) -> tuple | None:
+    if training_fingerprint is None or not hasattr(predictor, "transform_features"):
+        return None
+    # Independent of the row order, like the digests in the lineage of the tabular model
+    training_digest = hashlib.blake2b(np.sort(training_fingerprint["row_hash"].to_numpy()).tobytes(), digest_size=16).hexdigest()
+    feature_types = sorted((feature, repr(types)) for feature, types in predictor.feature_metadata_in.to_dict().items())
+    return training_digest, tuple(predictor.features()), tuple(feature_types)
+
+
+def _check_label_column(test_data: pd.DataFrame, label_column: str):
     # Ensure the target column exists in the test data
     if label_column not in test_data.columns:
         raise ValueError(f"The specified label column '{label_column}' is not in the test data.")
 
-    # Separate the actual labels
-    actual_labels = test_data[label_column]
 
-    # Drop the target column from the test data to prevent data leakage
-    test_data_features = test_data.drop(columns=[label_column])
+def predict_scores(predictor, features: pd.DataFrame) -> pd.Series:
+    """
+    Predict the exam scores of the given students.
 
-    # Generate predictions
-    predictions = predictor.predict(data=test_data_features)
+    Args:
+        predictor: The trained AutoGluon predictor.
+        features (pd.DataFrame): The features of the students, without the target column.
 
-    # Combine test data, actual labels, and predictions into a single DataFrame
-    results_df = test_data.copy()
-    results_df['Pred_Score'] = predictions
-    results_df['Actual_Score'] = actual_labels
+    Returns:
+        pd.Series: The predicted scores, aligned with the index of the features.
+    """
+    return predictor.predict(data=features)
 
-    return results_df
+
+def _predict(predictor, test_data: pd.DataFrame, label_column: str) -> pd.DataFrame:
+    # Drop the target column from the test data to prevent data leakage
+    predictions = predict_scores(predictor, test_data.drop(columns=[label_column]))
+
+    # Combine test data, actual labels, and predictions into a single DataFrame
+    return test_data.assign(Pred_Score=predictions, Actual_Score=test_data[label_column])
@@ -1,38 +1,25 @@
 from kedro.pipeline import Pipeline, node, pipeline
-from .nodes import generate_predictions
+from .nodes import generate_predictions_wide
+
 
 def create_pipeline(**kwargs) -> Pipeline:
     return pipeline(
         [
             node(
-                func=generate_predictions,
-                inputs=dict(
-                    predictor="autogluon_tabular_model",
-                    test_data="student_performance_factors_test_data",
-                    label_column="params:label_column"
-                ),
-                outputs="autogluon_tabular_predictions",
-                name="generate_tabular_predictions_node",
-            ),
-            node(
-                func=generate_predictions,
-                inputs=dict(
-                    predictor="autogluon_tabular_nn_model",
-                    test_data="student_performance_factors_test_data",
-                    label_column="params:label_column"
-                ),
-                outputs="autogluon_tabular_nn_predictions",
-                name="generate_tabular_nn_predictions_node",
-            ),
-            node(
-                func=generate_predictions,
+                func=generate_predictions_wide,
                 inputs=dict(
-                    predictor="autogluon_multimodal_model",
-                    test_data="student_performance_factors_test_data",
-                    label_column="params:label_column"
+                    test_batches="student_performance_factors_test_data@batches",
+                    label_column="params:label_column",
+                    scoring="params:scoring",
+                    tabular="autogluon_tabular_inference_artifact",
+                    tabular_nn="autogluon_tabular_nn_inference_artifact",
+                    multimodal="autogluon_multimodal_model",
+                    tabular_training_fingerprint="autogluon_tabular_model_fingerprint",
+                    tabular_nn_training_fingerprint="autogluon_tabular_nn_model_fingerprint",
                 ),
-                outputs="autogluon_multimodal_predictions",
-                name="generate_multimodal_predictions_node",
+                outputs="autogluon_predictions@batches",
+                name="generate_predictions_node",
+                tags="cpu_bound",  # the feature generation of AutoGluon holds the GIL
             ),
         ]
     )
@@ -1,29 +1,104 @@
+import logging
+import math
+from collections.abc import Iterable, Iterator
+
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 
-def split_data(data: pd.DataFrame, train_size: float = 0.9, test_size: float = 0.1):
+logger = logging.getLogger(__name__)
+
+
+def split_data(data: Iterable[pd.DataFrame], split: dict) -> Iterator[dict]:
     """
-    Splits the dataset into training and test sets without stratification.
+    Splits the dataset into training and test sets in one streaming pass over its chunks.
+
+    Every row is assigned deterministically, so the split is reproducible and rows that are appended
+    to the data later do not move the existing rows to the other set. The modes are:
+        random: a row goes to the test set if the hash of its key with the seed is below `test_size`.
+        stratified: every `1 / test_size`-th row of each stratum goes to the test set, starting at
+            a seeded offset per stratum, so each stratum is split in the exact proportions.
+        group: like random, but the key is the group column, so a group is never split.
+        time: rows at or after `time_cutoff` go to the test set.
 
     Args:
-        data (pd.DataFrame): The dataset to split.
-        train_size (float): Proportion of the data for training.
-        test_size (float): Proportion of the data for testing.
+        data: Chunks of the dataset to split.
+        split: The split parameters.
 
-    Returns:
-        dict: A dictionary containing the split data as 'train' and 'test'.
+    Yields:
+        dict: A dictionary containing the split chunk as 'train' and 'test'.
     """
+    train_size, test_size = split["train_size"], split["test_size"]
     # Ensure the proportions sum up to 1.0
-    assert train_size + test_size == 1.0, "Train and test proportions must sum to 1.0."
-
-    # Split into train and test
-    train_data, test_data = train_test_split(
-        data,
-        test_size=test_size,
-        random_state=42  # Set a random seed for reproducibility
-    )
-
-    return {
-        "train": train_data,
-        "test": test_data
-    }
\ No newline at end of file
+    if not math.isclose(train_size + test_size, 1.0):
+        raise ValueError(f"Train and test proportions must sum to 1.0, got {train_size} and {test_size}.")
+
+    if split["mode"] not in _SPLIT_MODES:
+        raise ValueError(f"Unknown split mode '{split['mode']}', expected one of {list(_SPLIT_MODES)}.")
+
+    assign_to_test = _SPLIT_MODES[split["mode"]](split)
+    num_train = num_test = 0
+    for chunk in data:
+        is_test = assign_to_test(chunk)
+        num_train += int((~is_test).sum())
+        num_test += int(is_test.sum())
+        yield {
+            "train": chunk[~is_test],
+            "test": chunk[is_test]
+        }
+
+    logger.info("Split the data into %d training and %d test rows", num_train, num_test)
+
+
+def _random_split(split: dict):
+    def assign_to_test(chunk: pd.DataFrame) -> np.ndarray:
+        key = chunk if split["key_columns"] is None else chunk[split["key_columns"]]
+        return _unit_hash(key, split["seed"]) < split["test_size"]
+    return assign_to_test
+
+
+def _group_split(split: dict):
+    def assign_to_test(chunk: pd.DataFrame) -> np.ndarray:
+        return _unit_hash(chunk[[split["group_column"]]], split["seed"]) < split["test_size"]
+    return assign_to_test
+
+
+def _stratified_split(split: dict):
+    test_size = split["test_size"]
+    # Rows seen per stratum in the previous chunks
+    seen = {}
+
+    def assign_to_test(chunk: pd.DataFrame) -> np.ndarray:
+        strata = chunk[split["stratify_column"]]
+        position = strata.groupby(strata, observed=True, dropna=False).cumcount().to_numpy(dtype=float)
+        offset = strata.map(lambda stratum: seen.get(stratum, 0)).to_numpy(dtype=float)
+        phase = _unit_hash(strata.to_frame(), split["seed"])
+        position += offset
+        for stratum, count in strata.value_counts(dropna=False).items():
+            seen[stratum] = seen.get(stratum, 0) + count
+        # A row is a test row whenever the running test quota of its stratum passes the next integer
+        return np.floor((position + 1) * test_size + phase) > np.floor(position * test_size + phase)
+    return assign_to_test
+
+
+def _time_split(split: dict):
+    def assign_to_test(chunk: pd.DataFrame) -> np.ndarray:
+        return (chunk[split["time_column"]] >= split["time_cutoff"]).to_numpy()
+    return assign_to_test
+
+
+_SPLIT_MODES = {
+    "random": _random_split,
+    "stratified": _stratified_split,
+    "group": _group_split,
+    "time": _time_split,
+}
+
+
+def _unit_hash(key: pd.DataFrame, seed: int) -> np.ndarray:
+    """
+    Hashes the key of every row with the seed to a number in [0, 1). Categorical columns hash like their values.
+    """
+    hashes = pd.util.hash_pandas_object(key, index=False).to_numpy()
+    # The hash key of pandas only applies to strings, so the seed is mixed into the hash of every row instead
+    seed_hash = pd.util.hash_array(np.array([seed], dtype=np.uint64))[0]
+    return pd.util.hash_array(hashes ^ seed_hash) / 2.0**64
@@ -6,10 +6,10 @@ def create_pipeline(**kwargs) -> Pipeline:
         [
             node(
                 func=split_data,
-                inputs="student_performance_factors_preprocessed",
+                inputs=["student_performance_factors_encoded@chunks", "params:split"],
                 outputs=dict(
-                    train="student_performance_factors_train_data",
-                    test="student_performance_factors_test_data"
+                    train="student_performance_factors_train_data@chunks",
+                    test="student_performance_factors_test_data@batches"
                 ),
                 name="split_data_node"
             )
@@ -1 +1 @@
-from .pipeline import create_pipeline  # NOQA
+from .pipeline import create_incremental_pipeline, create_parallel_pipeline, create_pipeline, create_sweep_pipeline  # NOQA
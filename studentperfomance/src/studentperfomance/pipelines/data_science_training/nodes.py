@@ -1,43 +1,549 @@
-from autogluon.tabular import TabularPredictor
-from autogluon.multimodal import MultiModalPredictor
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
 import pandas as pd
 
-def train_tabular_model(train_data: pd.DataFrame, label_column: str):
+logger = logging.getLogger(__name__)
+
+
+def train_tabular_model(train_data: pd.DataFrame, label_column: str, training: dict, resources: dict = None):
     """
     Train a tabular model using AutoGluon.
     """
+    from autogluon.tabular import TabularPredictor
+
+    resources = resources or _sequential_resources(training)
     predictor = TabularPredictor(label=label_column).fit(
-        train_data, 
-        presets='best_quality',
-        time_limit= 4 * 3600,  # Set time limit to 4 hours (4 * 3600 seconds)
-        ag_args_fit={'num_gpus': 1}  # Enable GPU usage if available
+        train_data,
+        presets=training["presets"],
+        hyperparameters=training.get("hyperparameters"),  # None trains the default models of the presets
+        time_limit=training["time_limit"],
+        num_cpus=resources["num_cpus"],
+        memory_limit=resources["memory_limit_gb"],
+        ag_args_fit={'num_gpus': resources["num_gpus"]}  # Enable GPU usage if available
     )
     return predictor
-    
 
-def train_tabular_nn_model(train_data: pd.DataFrame, label_column: str):
+
+def train_tabular_nn_model(train_data: pd.DataFrame, label_column: str, training: dict, resources: dict = None):
     """
     Train a tabular model focused on neural networks using AutoGluon.
     """
+    from autogluon.tabular import TabularPredictor
+
+    resources = resources or _sequential_resources(training)
     predictor = TabularPredictor(label=label_column).fit(
         train_data,
-        presets="best_quality",
-        hyperparameters={"NN_TORCH": {}},
-        time_limit= 4 * 3600,  # Set time limit to 4 hours (4 * 3600 seconds)
-        ag_args_fit={'num_gpus': 1}  # Enable GPU usage if available
+        presets=training["presets"],
+        hyperparameters={"NN_TORCH": training.get("hyperparameters") or {}},
+        time_limit=training["time_limit"],
+        num_cpus=resources["num_cpus"],
+        memory_limit=resources["memory_limit_gb"],
+        ag_args_fit={'num_gpus': resources["num_gpus"]}  # Enable GPU usage if available
     )
     return predictor
 
-def train_multimodal_model(train_data: pd.DataFrame, label_column: str):
+def train_multimodal_model(train_data: pd.DataFrame, label_column: str, training: dict, resources: dict = None):
     """
     Train a multimodal model using AutoGluon.
+    The MultiModalPredictor has no memory limit, only its CPU threads and workers are bounded.
     """
+    from autogluon.multimodal import MultiModalPredictor
+
+    resources = resources or _sequential_resources(training)
+    hyperparameters = {**(training.get("hyperparameters") or {}), 'env.num_gpus': resources["num_gpus"]}
+    if resources["num_cpus"] != "auto":
+        import torch
+
+        torch.set_num_threads(resources["num_cpus"])
+        hyperparameters['env.num_workers'] = resources["num_cpus"]
+        hyperparameters['env.num_workers_inference'] = resources["num_cpus"]
+
     predictor = MultiModalPredictor(label=label_column).fit(
         train_data,
-        presets='best_quality',
-        time_limit= 4 * 3600,
-        hyperparameters={
-            'env.num_gpus': 1,  
-        }
+        presets=training["presets"],
+        time_limit=training["time_limit"],
+        hyperparameters=hyperparameters,
     )
     return predictor
+
+
+def train_tabular_model_with_lineage(train_data: pd.DataFrame, label_column: str, training: dict):
+    """
+    Train a tabular model using AutoGluon and record the rows it was trained on, which are the base
+    that the incremental mode finds the new rows against.
+
+    Args:
+        train_data: The training dataset.
+        label_column: The name of the target column.
+        training: The training parameters.
+
+    Returns:
+        The predictor, the hashes of its training rows and its lineage, which starts with this fit.
+    """
+    predictor = train_tabular_model(train_data, label_column, training)
+    return predictor, *_full_fit_lineage(train_data, predictor)
+
+
+def train_tabular_nn_model_with_fingerprint(train_data: pd.DataFrame, label_column: str, training: dict):
+    """
+    Train a tabular model focused on neural networks using AutoGluon and record the rows it was trained
+    on, by which the prediction pipeline finds the predictors that share their feature pipeline.
+
+    Args:
+        train_data: The training dataset.
+        label_column: The name of the target column.
+        training: The training parameters.
+
+    Returns:
+        The predictor and the hashes of its training rows.
+    """
+    return train_tabular_nn_model(train_data, label_column, training), _row_fingerprint(train_data)
+
+
+def _full_fit_lineage(train_data: pd.DataFrame, predictor) -> tuple[pd.DataFrame, dict]:
+    # Returned by the nodes that fit the model, so the lineage only changes together with the model
+    fingerprint = _row_fingerprint(train_data)
+    entry = _lineage_entry("full", fingerprint, new_rows=len(fingerprint), model_path=str(predictor.path))
+    return fingerprint, {"history": [entry]}
+
+
+def train_tabular_model_incremental(
+    train_data: pd.DataFrame,
+    previous_model,
+    previous_fingerprint: pd.DataFrame,
+    previous_lineage: dict,
+    label_column: str,
+    training: dict,
+):
+    """
+    Updates the tabular model with the training rows that were added since its last full fit.
+
+    The best model of the last full fit and the models it is stacked on are refitted on the rows of
+    that fit plus the new rows, with the hyperparameters and iterations found by the full fit, and the
+    ensemble is stacked again. That skips the model search, bagging and all models the best one does
+    not use. A full fit under the `training` time limit is only done once the new rows drifted from the
+    base rows (population stability index of a column above `training.incremental.max_drift`) or
+    rows of the last full fit were removed.
+
+    Args:
+        train_data: The current training dataset.
+        previous_model: The current tabular predictor.
+        previous_fingerprint: The hashes of the rows of the last full fit.
+        previous_lineage: The history of the fits of the current predictor.
+        label_column: The name of the target column.
+        training: The training parameters.
+
+    Returns:
+        The updated predictor, the hashes of the rows of its last full fit and its lineage.
+    """
+    incremental = training["incremental"]
+    fingerprint = _row_fingerprint(train_data)
+    is_new = ~fingerprint["row_hash"].isin(previous_fingerprint["row_hash"]).to_numpy()
+    num_kept = len(fingerprint) - is_new.sum()
+    if not is_new.any() and num_kept == len(previous_fingerprint):
+        logger.info("No new training rows since the last fit, the tabular model is unchanged")
+        return previous_model, previous_fingerprint, previous_lineage
+
+    drift = None
+    if num_kept < len(previous_fingerprint):
+        reason = f"{len(previous_fingerprint) - num_kept} rows of the last full fit were removed"
+    else:
+        drift = _population_stability_index(train_data[~is_new], train_data[is_new], incremental["drift_bins"])
+        column = max(drift, key=drift.get)
+        reason = f"the new rows drifted, {column} has a population stability index of {drift[column]:.3f}"
+        if drift[column] <= incremental["max_drift"]:
+            reason = None
+
+    history = previous_lineage["history"]
+    if reason is not None:
+        logger.info("Full fit of the tabular model, because %s", reason)
+        predictor = train_tabular_model(train_data, label_column, training)
+        base_fingerprint = fingerprint
+        entry = _lineage_entry("full", fingerprint, new_rows=int(is_new.sum()), reason=reason)
+    else:
+        logger.info("Refitting the tabular model with %d new rows", is_new.sum())
+        predictor, refit_models = _refit_with_new_rows(previous_model, train_data[is_new])
+        base_fingerprint = previous_fingerprint
+        entry = _lineage_entry("incremental", fingerprint, new_rows=int(is_new.sum()), refit_models=refit_models)
+
+    entry["max_drift"] = max(drift.values()) if drift else None
+    entry["model_path"] = str(predictor.path)
+    _remove_incremental_copies(keep=[previous_model.path, predictor.path])
+    return predictor, base_fingerprint, {"history": [*history, entry]}
+
+
+# Directory of the copies that the incremental fits refit
+_INCREMENTAL_MODELS_DIR = "AutogluonModels"
+
+
+def _refit_with_new_rows(predictor, new_data: pd.DataFrame):
+    # The refit happens in a copy, so the previous model stays intact
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    predictor = predictor.clone(path=os.path.join(_INCREMENTAL_MODELS_DIR, f"ag-incremental-{timestamp}"), return_clone=True)
+
+    refit_map = predictor.model_refit_map()
+    best = {refit: model for model, refit in refit_map.items()}.get(predictor.model_best, predictor.model_best)
+    if refit_map:
+        # The refit of an earlier incremental fit is replaced, the new rows are counted from the last full fit
+        predictor.set_model_best(best)
+        predictor.delete_models(models_to_delete=list(refit_map.values()), dry_run=False)
+
+    refit_models = predictor.refit_full(model=best, train_data_extra=new_data, set_best_to_refit_full=True)
+    return predictor, refit_models
+
+
+def _remove_incremental_copies(keep: list[str]):
+    """
+    Removes the copies of earlier incremental fits, except the ones of the previous and the new model.
+    The previous one stays until the next update, so a run that fails before the new model is saved
+    still has the model it started with.
+    """
+    keep = {os.path.abspath(path) for path in keep}
+    for path in Path(_INCREMENTAL_MODELS_DIR).glob("ag-incremental-*"):
+        if os.path.abspath(path) not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _row_fingerprint(train_data: pd.DataFrame) -> pd.DataFrame:
+    # Categorical and narrow integer columns hash like their values, so the hashes do not depend on the dtypes
+    return pd.DataFrame({"row_hash": pd.util.hash_pandas_object(train_data, index=False).to_numpy()})
+
+
+def _lineage_entry(mode: str, fingerprint: pd.DataFrame, new_rows: int, **details) -> dict:
+    import hashlib
+
+    digest = hashlib.blake2b(np.sort(fingerprint["row_hash"].to_numpy()).tobytes(), digest_size=16).hexdigest()
+    return {
+        "mode": mode,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "rows": len(fingerprint),
+        "new_rows": new_rows,
+        "data_fingerprint": digest,
+        **details,
+    }
+
+
+def _population_stability_index(expected: pd.DataFrame, actual: pd.DataFrame, bins: int) -> dict[str, float]:
+    """
+    Computes the population stability index of every column between the expected and the actual rows,
+    over the categories of categorical columns and over `bins` quantile bins of the expected values otherwise.
+    """
+    from studentperfomance.sketches import create_sketch, population_stability_index, sketch_like
+
+    expected_sketch = create_sketch(expected, bins)
+    actual_sketch = sketch_like(expected_sketch, actual)
+    return {
+        column: population_stability_index(expected_sketch["columns"][column], actual_sketch["columns"][column])
+        for column in expected.columns
+    }
+
+
+# Trainers of the parallel mode, keyed by the node they replace in the sequential pipeline
+TRAINERS = {
+    "train_tabular_model_node": train_tabular_model,
+    "train_tabular_nn_model_node": train_tabular_nn_model,
+    "train_multimodal_model_node": train_multimodal_model,
+}
+
+
+def train_models_in_parallel(train_data: pd.DataFrame, label_column: str, training: dict):
+    """
+    Train all models at the same time, each one in its own CPU-only process with an equal share
+    of the CPU and memory budget configured in `training.parallel`.
+
+    Args:
+        train_data: The training dataset.
+        label_column: The name of the target column.
+        training: The training parameters.
+
+    Returns:
+        The tabular, tabular NN and multimodal predictors, the hashes of the training rows and the
+        lineage of the tabular predictor, the hashes of the training rows of the tabular NN predictor
+        and a report of the wall-clock time each trainer took and saved compared to a sequential run.
+    """
+    resources = _parallel_resources(training, num_trainers=len(TRAINERS))
+    logger.info("Training %d models in parallel with %s each", len(TRAINERS), resources)
+
+    # Spawned workers do not inherit the thread pools of torch and friends from this process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(TRAINERS), mp_context=context) as executor:
+        futures = {
+            name: executor.submit(_timed_training, trainer, train_data, label_column, training, resources)
+            for name, trainer in TRAINERS.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+
+    runs = {name: (start, end) for name, (_, start, end) in results.items()}
+    timings = _wall_clock_report(runs)
+    logger.info("Parallel training wall-clock report:\n%s", timings.to_string(index=False))
+
+    predictors = [predictor for predictor, _, _ in results.values()]
+    fingerprint, lineage = _full_fit_lineage(train_data, results["train_tabular_model_node"][0])
+    return *predictors, fingerprint, lineage, fingerprint, timings
+
+
+def _timed_training(trainer, train_data: pd.DataFrame, label_column: str, training: dict, resources: dict):
+    start = time.time()
+    predictor = trainer(train_data, label_column, training, resources)
+    return predictor, start, time.time()
+
+
+def _sequential_resources(training: dict) -> dict:
+    return {"num_cpus": "auto", "num_gpus": training["num_gpus"], "memory_limit_gb": "auto"}
+
+
+def _parallel_resources(training: dict, num_trainers: int) -> dict:
+    """
+    Splits the CPU and memory budget of the parallel mode evenly between the trainers.
+    """
+    budget = training["parallel"]
+    num_cpus = budget["num_cpus"]
+    if num_cpus == "auto":
+        num_cpus = os.cpu_count()
+    memory_limit_gb = budget["memory_limit_gb"]
+    if memory_limit_gb == "auto":
+        import psutil  # installed with AutoGluon
+
+        memory_limit_gb = psutil.virtual_memory().total / 1024**3
+
+    return {
+        "num_cpus": max(1, int(num_cpus) // num_trainers),
+        "num_gpus": 0,
+        "memory_limit_gb": float(memory_limit_gb) / num_trainers,
+    }
+
+
+def _wall_clock_report(runs: dict[str, tuple[float, float]]) -> pd.DataFrame:
+    """
+    Attributes the wall-clock time of concurrent runs to the nodes. Every interval is shared equally
+    by the nodes running during it, so the shares add up to the elapsed wall-clock time and the savings
+    add up to the difference to a sequential run.
+
+    Args:
+        runs: Start and end timestamp of every node.
+
+    Returns:
+        The duration, wall-clock share and saved time of every node and in total.
+    """
+    events = sorted({timestamp for run in runs.values() for timestamp in run})
+    shares = dict.fromkeys(runs, 0.0)
+    for begin, end in zip(events, events[1:]):
+        active = [name for name, (start, stop) in runs.items() if start <= begin and end <= stop]
+        for name in active:
+            shares[name] += (end - begin) / len(active)
+
+    report = pd.DataFrame({
+        "node": list(runs),
+        "duration_s": [end - start for start, end in runs.values()],
+        "wall_clock_share_s": list(shares.values()),
+    })
+    total = pd.DataFrame({
+        "node": ["total"],
+        "duration_s": [report["duration_s"].sum()],
+        "wall_clock_share_s": [max(events) - min(events)],
+    })
+    report = pd.concat([report, total], ignore_index=True)
+    report["saved_s"] = report["duration_s"] - report["wall_clock_share_s"]
+    return report.round(1)
+
+
+def run_sweep(train_data: pd.DataFrame, label_column: str, training: dict, sweep: dict):
+    """
+    Trains one model type with every config of a grid or random search space and records the trials.
+
+    A config overrides keys of the `training` parameters, e.g. `presets`, `time_limit` or `hyperparameters`.
+    The trials run in CPU-only worker processes that share the `training.parallel` budget. Losing configs
+    are stopped early by successive halving: every rung trains the remaining configs with a fraction of
+    their time limit and only the best `keep_fraction` of them are trained again in the next rung.
+    No trial is started once it could exceed the total `max_cpu_hours` budget.
+
+    Every trial is recorded in the SQLite database `sweep.database`, next to the session store,
+    as soon as it has finished.
+
+    Args:
+        train_data: The training dataset, a holdout of it is used to score the trials.
+        label_column: The name of the target column.
+        training: The training parameters the configs are applied to.
+        sweep: The sweep parameters.
+
+    Returns:
+        A table of all trials and the training parameters of the best config.
+    """
+    from kedro.framework.project import settings
+
+    from studentperfomance.pipelines.data_science_comparison.nodes import _LOWER_IS_BETTER
+
+    configs = _sweep_configs(sweep)
+    trainer = TRAINERS[sweep["trainer"]]
+    validation_data = train_data.sample(frac=sweep["validation_fraction"], random_state=sweep["random_state"])
+    fit_data = train_data.drop(index=validation_data.index)
+    resources = _parallel_resources(training, num_trainers=sweep["num_workers"])
+    database = _SweepDatabase(Path(settings.SESSION_STORE_ARGS["path"]) / sweep["database"])
+    sweep_id = database.start(sweep, num_configs=len(configs))
+    logger.info("Sweep %s: %d configs of %s with %s per trial", sweep_id, len(configs), sweep["trainer"], resources)
+
+    budget_cpu_s = sweep["max_cpu_hours"] * 3600
+    used_cpu_s = 0.0
+    trials = []
+    survivors = list(range(len(configs)))
+    best = None  # best config of the last rung with a completed trial
+    rungs = sweep["early_stopping"]["rungs"]
+    # Spawned workers do not inherit the thread pools of torch and friends from this process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=sweep["num_workers"], mp_context=context) as executor:
+        for rung, fraction in enumerate(rungs):
+            pending = [(index, _trial_training(training, configs[index], fraction)) for index in survivors]
+            running = {}
+            scores = {}
+            while pending or running:
+                # Trials are started while their time limit fits into the remaining budget
+                reserved_cpu_s = sum(limit for _, limit in running.values())
+                while pending and len(running) < sweep["num_workers"]:
+                    index, trial_training = pending[0]
+                    limit_cpu_s = trial_training["time_limit"] * resources["num_cpus"]
+                    if used_cpu_s + reserved_cpu_s + limit_cpu_s > budget_cpu_s:
+                        break
+                    pending.pop(0)
+                    future = executor.submit(_run_trial, trainer, fit_data, validation_data, label_column, trial_training, resources)
+                    running[future] = (index, limit_cpu_s)
+                    reserved_cpu_s += limit_cpu_s
+
+                if not running:
+                    for index, _ in pending:
+                        trials.append(database.record(sweep_id, index, rung, configs[index], status="skipped_budget"))
+                    pending = []
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, _ = running.pop(future)
+                    try:
+                        metrics, started_at, duration_s = future.result()
+                    except Exception as error:  # a failing config must not end the sweep
+                        logger.warning("Sweep trial %d failed: %s", index, error)
+                        trials.append(database.record(sweep_id, index, rung, configs[index], status="failed"))
+                        continue
+                    cpu_s = duration_s * resources["num_cpus"]
+                    used_cpu_s += cpu_s
+                    scores[index] = metrics[sweep["metric"]]
+                    trials.append(database.record(
+                        sweep_id, index, rung, configs[index], status="completed", started_at=started_at,
+                        duration_s=duration_s, cpu_hours=cpu_s / 3600, score=scores[index], metrics=metrics,
+                    ))
+                    logger.info("Sweep trial %d, rung %d: %s = %.4f", index, rung, sweep["metric"], scores[index])
+
+            ranked = sorted(scores, key=scores.get, reverse=sweep["metric"] not in _LOWER_IS_BETTER)
+            survivors = ranked[:math.ceil(len(ranked) * sweep["early_stopping"]["keep_fraction"])]
+            if ranked:
+                best = ranked[0]
+
+    database.finish(sweep_id, used_cpu_s / 3600)
+    if best is None:
+        raise RuntimeError(f"No trial of sweep {sweep_id} completed, see its trials in {database.path}")
+    logger.info("Sweep %s used %.2f CPU hours, best config: %s", sweep_id, used_cpu_s / 3600, configs[best])
+    return pd.DataFrame(trials), {**training, **configs[best]}
+
+
+def _sweep_configs(sweep: dict) -> list[dict]:
+    """
+    Lists the configs of the search space: all combinations of the values in the grid mode,
+    `num_trials` distinct combinations drawn with `random_state` in the random mode.
+    """
+    keys = list(sweep["space"])
+    values = [sweep["space"][key] for key in keys]
+    combinations = list(itertools.product(*values))
+    if sweep["strategy"] == "random":
+        rng = np.random.default_rng(sweep["random_state"])
+        size = min(sweep["num_trials"], len(combinations))
+        combinations = [combinations[i] for i in rng.choice(len(combinations), size=size, replace=False)]
+    elif sweep["strategy"] != "grid":
+        raise ValueError(f"Unknown sweep strategy '{sweep['strategy']}', expected 'grid' or 'random'")
+    return [dict(zip(keys, combination)) for combination in combinations]
+
+
+def _trial_training(training: dict, config: dict, fraction: float) -> dict:
+    trial_training = {**training, **config}
+    trial_training["time_limit"] = trial_training["time_limit"] * fraction
+    return trial_training
+
+
+def _run_trial(trainer, fit_data: pd.DataFrame, validation_data: pd.DataFrame, label_column: str, training: dict, resources: dict):
+    from studentperfomance.pipelines.data_science_comparison.nodes import _regression_metrics
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    start = time.time()
+    predictor = trainer(fit_data, label_column, training, resources)
+    duration_s = time.time() - start
+
+    try:
+        predicted = np.asarray(predictor.predict(validation_data.drop(columns=[label_column])), dtype=float)
+    finally:
+        # Only the scores of a trial are kept, the training pipeline trains the best config again
+        shutil.rmtree(predictor.path, ignore_errors=True)
+    actual = validation_data[label_column].to_numpy(dtype=float)
+    metrics = {name: float(value) for name, value in _regression_metrics(predicted, actual, within_k=[]).items()}
+    return metrics, started_at, duration_s
+
+
+class _SweepDatabase:
+    """
+    Records the sweeps and their trials in a SQLite database.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            connection.executescript(_SWEEP_SCHEMA)
+
+    def start(self, sweep: dict, num_configs: int) -> str:
+        sweep_id = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H.%M.%S.%fZ")
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            connection.execute(
+                "INSERT INTO sweeps VALUES (?, ?, ?, ?, ?, ?, NULL)",
+                (sweep_id, sweep["trainer"], sweep["strategy"], json.dumps(sweep["space"]), num_configs, sweep["metric"]),
+            )
+        return sweep_id
+
+    def record(self, sweep_id: str, trial: int, rung: int, config: dict, status: str, started_at: str = None,
+               duration_s: float = None, cpu_hours: float = None, score: float = None, metrics: dict = None) -> dict:
+        record = {
+            "sweep_id": sweep_id, "trial": trial, "rung": rung, "config": json.dumps(config), "status": status,
+            "started_at": started_at, "duration_s": duration_s, "cpu_hours": cpu_hours, "score": score,
+            "metrics": json.dumps(metrics) if metrics is not None else None,
+        }
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            connection.execute(
+                "INSERT INTO trials VALUES (:sweep_id, :trial, :rung, :config, :status, :started_at, "
+                ":duration_s, :cpu_hours, :score, :metrics)",
+                record,
+            )
+        return record
+
+    def finish(self, sweep_id: str, cpu_hours: float):
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            connection.execute("UPDATE sweeps SET cpu_hours = ? WHERE sweep_id = ?", (cpu_hours, sweep_id))
+
+
+_SWEEP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sweeps (
+    sweep_id TEXT, trainer TEXT, strategy TEXT, space TEXT, num_configs INTEGER, metric TEXT, cpu_hours REAL
+);
+CREATE TABLE IF NOT EXISTS trials (
+    sweep_id TEXT, trial INTEGER, rung INTEGER, config TEXT, status TEXT, started_at TEXT,
+    duration_s REAL, cpu_hours REAL, score REAL, metrics TEXT
+);
+"""
@@ -1,35 +1,113 @@
 from kedro.pipeline import Pipeline, node, pipeline
-from .nodes import train_tabular_model, train_tabular_nn_model, train_multimodal_model
+from .nodes import (
+    train_tabular_model_with_lineage, train_tabular_nn_model_with_fingerprint, train_multimodal_model, train_models_in_parallel, run_sweep,
+    train_tabular_model_incremental,
+)
 
 def create_pipeline(**kwargs) -> Pipeline:
     return pipeline(
         [
             node(
-                func=train_tabular_model,
+                func=train_tabular_model_with_lineage,
                 inputs=dict(
-                    train_data="student_performance_factors_train_data",
-                    label_column="params:label_column"
+                    train_data="student_performance_factors_train_data@pandas",
+                    label_column="params:label_column",
+                    training="params:training"
                 ),
-                outputs="autogluon_tabular_model",
+                outputs=["autogluon_tabular_model", "autogluon_tabular_model_fingerprint", "autogluon_tabular_model_lineage"],
                 name="train_tabular_model_node",
+                tags="exclusive",  # uses the whole host, see studentperfomance.runner
             ),
             node(
-                func=train_tabular_nn_model,
+                func=train_tabular_nn_model_with_fingerprint,
                 inputs=dict(
-                    train_data="student_performance_factors_train_data",
-                    label_column="params:label_column"
+                    train_data="student_performance_factors_train_data@pandas",
+                    label_column="params:label_column",
+                    training="params:training"
                 ),
-                outputs="autogluon_tabular_nn_model",
+                outputs=["autogluon_tabular_nn_model", "autogluon_tabular_nn_model_fingerprint"],
                 name="train_tabular_nn_model_node",
+                tags="exclusive",  # uses the whole host, see studentperfomance.runner
             ),
             node(
                 func=train_multimodal_model,
                 inputs=dict(
-                    train_data="student_performance_factors_train_data",
-                    label_column="params:label_column"
+                    train_data="student_performance_factors_train_data@pandas",
+                    label_column="params:label_column",
+                    training="params:training"
                 ),
                 outputs="autogluon_multimodal_model",
                 name="train_multimodal_model_node",
+                tags="exclusive",  # uses the whole host, see studentperfomance.runner
+            ),
+        ]
+    )
+
+
+def create_parallel_pipeline(**kwargs) -> Pipeline:
+    """Trains the same models as `create_pipeline`, but concurrently on a CPU-only host."""
+    return pipeline(
+        [
+            node(
+                func=train_models_in_parallel,
+                inputs=dict(
+                    train_data="student_performance_factors_train_data@pandas",
+                    label_column="params:label_column",
+                    training="params:training"
+                ),
+                outputs=[
+                    "autogluon_tabular_model",
+                    "autogluon_tabular_nn_model",
+                    "autogluon_multimodal_model",
+                    "autogluon_tabular_model_fingerprint",
+                    "autogluon_tabular_model_lineage",
+                    "autogluon_tabular_nn_model_fingerprint",
+                    "parallel_training_timings",
+                ],
+                name="train_models_in_parallel_node",
+                tags="exclusive",  # uses the whole host, see studentperfomance.runner
+            ),
+        ]
+    )
+
+
+def create_incremental_pipeline(**kwargs) -> Pipeline:
+    """Updates the tabular model with the new training rows instead of training it from scratch."""
+    return pipeline(
+        [
+            node(
+                func=train_tabular_model_incremental,
+                inputs=dict(
+                    train_data="student_performance_factors_train_data@pandas",
+                    previous_model="autogluon_tabular_model_previous",
+                    previous_fingerprint="autogluon_tabular_model_fingerprint_previous",
+                    previous_lineage="autogluon_tabular_model_lineage_previous",
+                    label_column="params:label_column",
+                    training="params:training"
+                ),
+                outputs=["autogluon_tabular_model", "autogluon_tabular_model_fingerprint", "autogluon_tabular_model_lineage"],
+                name="train_tabular_model_incremental_node",
+                tags="exclusive",  # uses the whole host, see studentperfomance.runner
+            ),
+        ]
+    )
+
+
+def create_sweep_pipeline(**kwargs) -> Pipeline:
+    """Trains one model type with the configs of the `sweep` search space and records the trials."""
+    return pipeline(
+        [
+            node(
+                func=run_sweep,
+                inputs=dict(
+                    train_data="student_performance_factors_train_data@pandas",
+                    label_column="params:label_column",
+                    training="params:training",
+                    sweep="params:sweep"
+                ),
+                outputs=["sweep_trials", "sweep_best_training"],
+                name="run_sweep_node",
+                tags="exclusive",  # uses the whole host, see studentperfomance.runner
             ),
         ]
     )
@@ -0,0 +1,68 @@
+"""Headless rendering of the reporting plots.
+
+Every plot is built by a function that returns its own ``matplotlib.figure.Figure``.
+Those figures are not registered with ``pyplot``, so no global plotting state is shared
+between the plots and nothing stays open after a figure was rendered. The figures are
+drawn to PNG bytes with the non-interactive Agg renderer, concurrently in worker
+processes, and saved with ``studentperfomance.datasets.RenderedFigureDataset``.
+"""
+import io
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# A plot function and the arguments it is called with
+Plot = tuple[Callable, tuple]
+
+
+def render_figures(plots: dict[str, Plot], num_workers="auto", dpi: int = 100) -> dict[str, bytes]:
+    """
+    Renders the figures of the plots to PNG bytes, in parallel processes if there is more than one plot.
+
+    Args:
+        plots: The plot function and its arguments by output name.
+        num_workers: Number of processes, "auto" uses one per plot up to the number of CPUs.
+        dpi: Resolution of the images.
+
+    Returns:
+        The PNG bytes of every plot by output name.
+    """
+    if num_workers == "auto":
+        num_workers = os.cpu_count()
+    num_workers = max(1, min(int(num_workers), len(plots)))
+
+    if num_workers == 1:
+        return {name: _render(plot, args, dpi) for name, (plot, args) in plots.items()}
+
+    # Spawned workers start without the pyplot state and GUI backend of this process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=context) as executor:
+        futures = {name: executor.submit(_render, plot, args, dpi) for name, (plot, args) in plots.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def _render(plot: Callable, args: tuple, dpi: int) -> bytes:
+    figure = plot(*args)
+    image = io.BytesIO()
+    # Saving as PNG draws the figure with the Agg renderer, independent of the configured backend
+    figure.savefig(image, format="png", dpi=dpi)
+    figure.clear()
+    return image.getvalue()
+
+
+def scatter_or_hexbin(figure, ax, x: pd.Series, y: pd.Series, max_scatter_points: int):
+    """
+    Draws a scatter plot of `x` and `y`, or a hexbin density plot above `max_scatter_points` points,
+    which takes the same time to draw for any number of points.
+    """
+    import seaborn as sns
+
+    if len(x) <= max_scatter_points:
+        sns.scatterplot(x=x, y=y, ax=ax)
+        return
+
+    hexbin = ax.hexbin(x, y, gridsize=50, mincnt=1, cmap="viridis")
+    figure.colorbar(hexbin, ax=ax, label="Students")
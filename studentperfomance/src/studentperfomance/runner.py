@@ -0,0 +1,227 @@
+"""``FanOutRunner`` runs independent nodes concurrently, each in the executor that suits its workload.
+
+Run a pipeline with it by:
+    kedro run --runner studentperfomance.runner.FanOutRunner
+
+The runner is configured by the `runner` parameters in ``conf/base/parameters.yml``. Nodes are
+scheduled by their tags:
+
+- ``cpu_bound``: Python code that holds the GIL, run in worker processes.
+- ``exclusive``: uses the whole host on its own (e.g. an AutoGluon fit), run when no other node is running.
+- any other node: I/O or native code that releases the GIL, run in worker threads.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import chain
+from typing import TYPE_CHECKING, Any
+
+from kedro.io import AbstractDataset, MemoryDataset
+from kedro.runner import AbstractRunner
+from kedro.runner.task import Task
+
+if TYPE_CHECKING:
+    from kedro.io import CatalogProtocol
+    from kedro.pipeline import Pipeline
+    from kedro.pipeline.node import Node
+    from pluggy import PluginManager
+
+logger = logging.getLogger(__name__)
+
+CPU_BOUND_TAG = "cpu_bound"
+EXCLUSIVE_TAG = "exclusive"
+
+DEFAULT_RUNNER_CONFIG = {
+    "max_threads": "auto",
+    "max_processes": "auto",
+    "share_loaded_datasets": True,
+}
+
+
+class FanOutRunner(AbstractRunner):
+    """Runs the nodes of a pipeline as soon as their inputs exist, in threads or processes
+    depending on their tags. Persisted datasets that several nodes of the run load are loaded
+    once and shared in memory until their last consumer has finished.
+    """
+
+    def __init__(self, is_async: bool = False, extra_dataset_patterns: dict[str, dict[str, Any]] | None = None):
+        """Instantiates the runner.
+
+        Args:
+            is_async: Not supported, the node inputs and outputs are loaded and saved by the workers.
+            extra_dataset_patterns: Extra dataset factory patterns to be added to the catalog
+                during the run, by default unregistered datasets are ``MemoryDataset``.
+        """
+        if is_async:
+            logger.warning("'FanOutRunner' does not support asynchronous loading and saving, 'is_async' is ignored.")
+        super().__init__(
+            is_async=False,
+            extra_dataset_patterns=extra_dataset_patterns or {"{default}": {"type": "MemoryDataset"}},
+        )
+
+    def _get_executor(self, max_workers: int) -> None:
+        # `_run` manages a thread and a process pool itself
+        return None
+
+    def _run(
+        self,
+        pipeline: Pipeline,
+        catalog: CatalogProtocol,
+        hook_manager: PluginManager | None = None,
+        session_id: str | None = None,
+    ) -> None:
+        config = _runner_config(catalog)
+        load_counts = Counter(chain.from_iterable(node.inputs for node in pipeline.nodes))
+        if config["share_loaded_datasets"]:
+            _share_loaded_datasets(catalog, pipeline, load_counts)
+
+        process_nodes = {node for node in pipeline.nodes if CPU_BOUND_TAG in node.tags and _can_run_in_process(node, catalog)}
+        node_dependencies = pipeline.node_dependencies
+        todo_nodes = set(node_dependencies)
+        done_nodes: set[Node] = set()
+        running: dict = {}
+
+        threads = ThreadPoolExecutor(
+            # Threads mostly wait for I/O or native code, so there are more of them than CPUs like in the standard library
+            max_workers=_num_workers(config["max_threads"], auto=min(32, (os.cpu_count() or 1) + 4)),
+        )
+        # The process pool is only started when a node needs it
+        processes = None
+        try:
+            while True:
+                ready = sorted((node for node in todo_nodes if node_dependencies[node] <= done_nodes), key=lambda node: node.name)
+                for node in ready:
+                    exclusive = EXCLUSIVE_TAG in node.tags
+                    if running and (exclusive or any(EXCLUSIVE_TAG in other.tags for other in running.values())):
+                        continue
+                    if node in process_nodes:
+                        if processes is None:
+                            # Spawned workers do not inherit the thread pools of this process
+                            processes = ProcessPoolExecutor(
+                                max_workers=_num_workers(config["max_processes"], auto=os.cpu_count() or 1),
+                                mp_context=multiprocessing.get_context("spawn"),
+                            )
+                        # The hook manager cannot be pickled, the worker creates its own one
+                        task = Task(node=node, catalog=catalog, is_async=False, session_id=session_id, parallel=True)
+                        running[processes.submit(task)] = node
+                    else:
+                        task = Task(node=node, catalog=catalog, hook_manager=hook_manager, is_async=False, session_id=session_id)
+                        running[threads.submit(task)] = node
+                    todo_nodes.remove(node)
+                    if exclusive:
+                        break
+
+                if not running:
+                    if todo_nodes:
+                        self._raise_runtime_error(todo_nodes, done_nodes, set(ready), None)
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception:
+                        self._suggest_resume_scenario(pipeline, done_nodes, catalog)
+                        raise
+                    done_nodes.add(node)
+                    self._logger.info("Completed node: %s", node.name)
+                    self._logger.info("Completed %d out of %d tasks", len(done_nodes), len(pipeline.nodes))
+                    self._release_datasets(node, catalog, load_counts, pipeline)
+        finally:
+            threads.shutdown(wait=not running, cancel_futures=True)
+            if processes is not None:
+                processes.shutdown(wait=not running, cancel_futures=True)
+
+
+def _runner_config(catalog: CatalogProtocol) -> dict:
+    # Not `in catalog`, which also matches the default dataset pattern of the run, whose datasets are empty
+    config = catalog.load("params:runner") if catalog.exists("params:runner") else {}
+    return {**DEFAULT_RUNNER_CONFIG, **(config or {})}
+
+
+def _num_workers(num_workers, auto: int) -> int:
+    if num_workers == "auto":
+        return auto
+    return max(1, int(num_workers))
+
+
+def _can_run_in_process(node: Node, catalog: CatalogProtocol) -> bool:
+    """
+    A node in a worker process works on a copy of the catalog, so its outputs only
+    reach the other nodes if they are persisted.
+    """
+    in_memory = [name for name in node.outputs if _in_memory(catalog, name)]
+    if in_memory:
+        logger.warning("Node '%s' runs in a thread, because its outputs %s are only kept in memory", node.name, in_memory)
+    return not in_memory
+
+
+def _share_loaded_datasets(catalog: CatalogProtocol, pipeline: Pipeline, load_counts: Counter):
+    for name, count in load_counts.items():
+        if count < 2 or name.startswith("params:") or name == "parameters":
+            continue
+        if not _in_memory(catalog, name):
+            dataset = AbstractDataset.from_config(name, catalog.config_resolver.resolve_pattern(name))
+            # Replaced in the copy of the catalog that the runner got for this run
+            catalog.add(name, SharedLoadDataset(dataset), replace=True)
+
+
+def _in_memory(catalog: CatalogProtocol, name: str) -> bool:
+    """Whether a dataset is only kept in memory, by the type in its catalog configuration."""
+    dataset_type = catalog.config_resolver.resolve_pattern(name).get("type", "MemoryDataset")
+    return dataset_type.rsplit(".", 1)[-1] == "MemoryDataset"
+
+
+class SharedLoadDataset(AbstractDataset):
+    """Wraps a persisted dataset, so it is loaded once by the first node that needs it and
+    the later nodes get it from memory. Like a ``MemoryDataset``, every node gets its own copy
+    (DataFrames and arrays are copied, other objects deep-copied), so a node that changes its
+    input in place does not change the data of the nodes running next to it. Iterators, like
+    the chunks of a chunked dataset, can only be consumed once and are loaded anew for every node.
+    """
+
+    def __init__(self, dataset: AbstractDataset):
+        self._dataset = dataset
+        self._memory: MemoryDataset | None = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Any:
+        with self._lock:
+            if self._memory is None:
+                data = self._dataset.load()
+                if isinstance(data, Iterator):
+                    return data
+                # Copies the data on every load, by the copy mode it infers from the type of the data
+                self._memory = MemoryDataset(data)
+            memory = self._memory
+        return memory.load()
+
+    def save(self, data: Any) -> None:
+        with self._lock:
+            self._dataset.save(data)
+            self._memory = None
+
+    def _exists(self) -> bool:
+        return self._dataset.exists()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._memory = None
+        self._dataset.release()
+
+    def _describe(self) -> dict[str, Any]:
+        return {"dataset": self._dataset._describe()}
+
+    def __getstate__(self):
+        # Worker processes load the dataset themselves
+        return {"_dataset": self._dataset}
+
+    def __setstate__(self, state):
+        self.__init__(state["_dataset"])
@@ -0,0 +1,245 @@
+"""Long-lived local HTTP service that scores students with a trained predictor.
+
+The predictor is loaded once from the project's data catalog and kept warm.
+Concurrent requests are collected into micro-batches, so many single-student
+requests are scored with one vectorized ``predict`` call.
+
+Start it from the project root:
+    python -m studentperfomance.scoring_service --port 8080
+
+Endpoints:
+    POST /predict  A student (JSON object) or a list of students, returns ``Pred_Score`` per student.
+    GET  /metrics  p50/p99 latency, throughput and batch sizes of the recent requests.
+    GET  /health   Liveness check.
+"""
+import argparse
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from studentperfomance.pipelines.data_science_pred.nodes import predict_scores
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyMetrics:
+    """Thread-safe rolling window of request latencies and batch sizes."""
+
+    def __init__(self, window: int = 10_000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._finished_at = deque(maxlen=window)
+        self._batch_sizes = deque(maxlen=window)
+        self._requests_total = 0
+
+    def observe_request(self, latency_s: float):
+        with self._lock:
+            self._latencies.append(latency_s)
+            self._finished_at.append(time.monotonic())
+            self._requests_total += 1
+
+    def observe_batch(self, size: int):
+        with self._lock:
+            self._batch_sizes.append(size)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = np.fromiter(self._latencies, dtype=float)
+            finished_at = np.fromiter(self._finished_at, dtype=float)
+            batch_sizes = np.fromiter(self._batch_sizes, dtype=float)
+            requests_total = self._requests_total
+
+        if latencies.size == 0:
+            return {"requests_total": requests_total}
+
+        elapsed = time.monotonic() - finished_at[0]
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        return {
+            "requests_total": requests_total,
+            "window_requests": int(latencies.size),
+            "latency_p50_ms": round(float(p50), 3),
+            "latency_p99_ms": round(float(p99), 3),
+            "throughput_rps": round(latencies.size / elapsed, 1) if elapsed > 0 else None,
+            "mean_batch_size": round(float(batch_sizes.mean()), 2) if batch_sizes.size else None,
+        }
+
+
+class MicroBatcher:
+    """Collects concurrently submitted students into batches for a single ``predict`` call.
+
+    A batch is scored as soon as it holds ``max_batch_size`` students or the oldest
+    request waited ``max_wait_ms``, whichever comes first.
+    """
+
+    def __init__(self, predictor, metrics: LatencyMetrics, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        self._predictor = predictor
+        self._metrics = metrics
+        self._max_batch_size = max_batch_size
+        self._max_wait_s = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, students: list[dict]) -> Future:
+        future = Future()
+        self._queue.put((students, future))
+        return future
+
+    def _run(self):
+        while True:
+            requests = [self._queue.get()]
+            size = len(requests[0][0])
+            deadline = time.monotonic() + self._max_wait_s
+            while size < self._max_batch_size:
+                try:
+                    request = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                requests.append(request)
+                size += len(request[0])
+            self._score(requests)
+
+    def _score(self, requests: list[tuple[list[dict], Future]]):
+        students = [student for batch, _ in requests for student in batch]
+        try:
+            scores = predict_scores(self._predictor, pd.DataFrame.from_records(students)).tolist()
+        except Exception as exc:  # noqa: BLE001 - the error is handed to the waiting request
+            if len(requests) == 1:
+                requests[0][1].set_exception(exc)
+                return
+            # One malformed student fails the whole batch, e.g. a string in a numeric field changes the
+            # dtype of the column, so the requests are scored one by one and only the bad ones fail
+            for request in requests:
+                self._score([request])
+            return
+
+        self._metrics.observe_batch(len(students))
+        offset = 0
+        for batch, future in requests:
+            future.set_result(scores[offset:offset + len(batch)])
+            offset += len(batch)
+
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive connections avoid a TCP handshake per request and without Nagle's algorithm
+    # the small responses are not held back waiting for the client's delayed ACK
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    batcher: MicroBatcher
+    metrics: LatencyMetrics
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._respond(200, self.metrics.snapshot())
+        elif self.path == "/health":
+            self._respond(200, {"status": "ok"})
+        else:
+            self._respond(404, {"error": f"Unknown path '{self.path}'."})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._respond(404, {"error": f"Unknown path '{self.path}'."})
+            return
+
+        start = time.perf_counter()
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError as exc:
+            # Invalid JSON, a body that is not UTF-8 or a Content-Length that is not a number
+            self._respond(400, {"error": f"Invalid request: {exc}"})
+            return
+
+        students = payload if isinstance(payload, list) else [payload]
+        if not students or not all(isinstance(student, dict) for student in students):
+            self._respond(400, {"error": "Expected a student object or a non-empty list of student objects."})
+            return
+
+        try:
+            scores = self.batcher.submit(students).result()
+        except Exception as exc:  # noqa: BLE001 - reported to the client instead of killing the connection
+            self._respond(400, {"error": str(exc)})
+            return
+
+        response = [{"Pred_Score": score} for score in scores]
+        self._respond(200, response if isinstance(payload, list) else response[0])
+        self.metrics.observe_request(time.perf_counter() - start)
+
+    def _respond(self, status: int, body):
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class ScoringServer(ThreadingHTTPServer):
+    # Many clients connecting at once overflow the default listen backlog of 5
+    request_queue_size = 128
+
+
+def load_predictor(project_path: Path, dataset_name: str, env: str = None):
+    """Loads a predictor and a few test rows to warm it up through the project's data catalog."""
+    from kedro.framework.session import KedroSession
+    from kedro.framework.startup import bootstrap_project
+
+    bootstrap_project(project_path)
+    with KedroSession.create(project_path=project_path, env=env) as session:
+        catalog = session.load_context().catalog
+        predictor = catalog.load(dataset_name)
+        label_column = catalog.load("params:label_column")
+        warmup_data = catalog.load("student_performance_factors_test_data@pandas").head(8)
+
+    return predictor, warmup_data.drop(columns=[label_column])
+
+
+def serve(predictor, host: str, port: int, max_batch_size: int, max_wait_ms: float, warmup_data: pd.DataFrame = None):
+    if warmup_data is not None:
+        # The first predict call loads the models and compiles the feature pipeline
+        predict_scores(predictor, warmup_data)
+
+    metrics = LatencyMetrics()
+    handler = type("Handler", (ScoringRequestHandler,), {
+        "batcher": MicroBatcher(predictor, metrics, max_batch_size, max_wait_ms),
+        "metrics": metrics,
+    })
+    server = ScoringServer((host, port), handler)
+    logger.info("Scoring service listening on http://%s:%d", host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--dataset", default="autogluon_tabular_inference_artifact", help="Catalog entry of the predictor.")
+    parser.add_argument("--env", default=None, help="Kedro configuration environment.")
+    parser.add_argument("--project-path", type=Path, default=Path.cwd())
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    predictor, warmup_data = load_predictor(args.project_path, args.dataset, args.env)
+    serve(predictor, args.host, args.port, args.max_batch_size, args.max_wait_ms, warmup_data)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,28 @@
 from the Kedro defaults. For further information, including these default values, see
 https://docs.kedro.org/en/stable/kedro_project_setup/settings.html."""
 
+import os
+from pathlib import Path
+
 # Instantiated project hooks.
-# For example, after creating a hooks.py and defining a ProjectHooks class there, do
-# from pandas_viz.hooks import ProjectHooks
+from studentperfomance.hooks import NodeResultCacheHooks, ProfilingHooks  # noqa: E402
 
 # Hooks are executed in a Last-In-First-Out (LIFO) order.
-# HOOKS = (ProjectHooks(),)
+HOOKS = (
+    # Records timings and memory of every node and dataset next to the session store,
+    # KEDRO_PROFILE_NODES="node_a,node_b" additionally samples flame graphs of these nodes.
+    # Registered first, so its hooks run after those of the cache and also measure the cached generator nodes
+    ProfilingHooks(
+        reports_dir=Path(__file__).parents[2],
+        profile_nodes=tuple(filter(None, os.environ.get("KEDRO_PROFILE_NODES", "").split(","))),
+    ),
+    # Restores the outputs of nodes whose code, inputs and parameters did not change
+    NodeResultCacheHooks(cache_dir=Path(__file__).parents[2] / ".cache" / "node_results", max_size_bytes=5 * 1024**3),
+)
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
 
-from pathlib import Path  # noqa: E402
-
 from kedro_viz.integrations.kedro.sqlite_store import SQLiteStore  # noqa: E402
 
 # Class that manages storing KedroSession data.
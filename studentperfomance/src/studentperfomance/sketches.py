@@ -0,0 +1,168 @@
+"""Compact, mergeable sketches of the distributions of data columns.
+
+A sketch counts the values of every column in a fixed set of buckets: the quantile bins of the
+reference data for numeric columns and the levels of categorical columns. Sketches with the same
+buckets are merged by adding their counts, so the sketch of any number of rows or batches takes
+constant memory, and the drift scores between two sketches are computed from their counts alone.
+Sketches only consist of lists and numbers, so they can be saved as JSON.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def create_sketch(data: pd.DataFrame, bins: int = 10) -> dict:
+    """
+    Creates the reference sketch of the data, with `bins` quantile bins of every numeric column
+    and the levels of every other column as buckets.
+
+    Args:
+        data: The reference data, e.g. the training data.
+        bins: Number of quantile bins of the numeric columns, fewer for columns with few distinct values.
+
+    Returns:
+        The sketch of the data.
+    """
+    buckets = {}
+    for column, values in data.items():
+        if _is_numeric(values):
+            edges = np.unique(np.quantile(values.dropna(), np.linspace(0, 1, bins + 1)[1:-1])) if values.notna().any() else np.array([])
+            buckets[column] = {"kind": "numeric", "reference": column, "edges": edges.tolist()}
+        else:
+            levels = values.cat.categories if isinstance(values.dtype, pd.CategoricalDtype) else sorted(values.dropna().unique())
+            buckets[column] = {"kind": "categorical", "reference": column, "levels": [str(level) for level in levels]}
+    return _count(buckets, data)
+
+
+def sketch_like(reference: dict, data: pd.DataFrame, references: dict[str, str] | None = None) -> dict:
+    """
+    Sketches the data with the buckets of a reference sketch, so the two can be compared.
+
+    Args:
+        reference: The reference sketch.
+        data: The data to sketch.
+        references: The reference column of a column with another name, e.g. the label column
+            for a column of predictions. Other columns are only sketched if the reference has them.
+
+    Returns:
+        The sketch of the data.
+    """
+    references = references or {}
+    buckets = {}
+    for column in data.columns:
+        reference_column = references.get(column, column)
+        if reference_column in reference["columns"]:
+            bucket = reference["columns"][reference_column]
+            buckets[column] = {key: bucket[key] for key in ("kind", "edges", "levels") if key in bucket} | {"reference": reference_column}
+    return _count(buckets, data)
+
+
+def merge_sketches(left: dict, right: dict) -> dict:
+    """
+    Merges the sketches of two disjoint sets of rows with the same buckets. An empty sketch
+    (`{"rows": 0, "columns": {}}`) merges with any sketch.
+    """
+    if not left["columns"]:
+        return right
+    if not right["columns"]:
+        return left
+    if not compatible(left, right):
+        raise ValueError("Only sketches of the same columns and buckets can be merged.")
+
+    columns = {}
+    for column, sketch in left["columns"].items():
+        other = right["columns"][column]
+        merged = {**sketch, "counts": (np.asarray(sketch["counts"]) + other["counts"]).tolist(), "missing": sketch["missing"] + other["missing"]}
+        if sketch["kind"] == "numeric":
+            merged["min"] = _none_min(sketch["min"], other["min"])
+            merged["max"] = _none_max(sketch["max"], other["max"])
+        columns[column] = merged
+    return {"rows": left["rows"] + right["rows"], "columns": columns}
+
+
+def compatible(left: dict, right: dict) -> bool:
+    """Whether two sketches have the same columns with the same buckets."""
+    return left["columns"].keys() == right["columns"].keys() and all(
+        sketch.get("edges") == right["columns"][column].get("edges") and sketch.get("levels") == right["columns"][column].get("levels")
+        for column, sketch in left["columns"].items()
+    )
+
+
+def population_stability_index(expected: dict, actual: dict) -> float:
+    """
+    Computes the population stability index between the sketches of a column, over its buckets.
+    Empty buckets get a small share, so the logarithm is defined.
+    """
+    expected_shares, actual_shares = _shares(expected), _shares(actual)
+    if expected_shares is None or actual_shares is None:
+        return float("nan")
+    expected_shares, actual_shares = np.clip(expected_shares, 1e-4, None), np.clip(actual_shares, 1e-4, None)
+    return float(np.sum((actual_shares - expected_shares) * np.log(actual_shares / expected_shares)))
+
+
+def kolmogorov_smirnov(expected: dict, actual: dict) -> float:
+    """
+    Computes the Kolmogorov-Smirnov statistic between the sketches of a numeric column, the largest
+    difference of their cumulative distributions at the bucket edges. It is exact for columns with
+    fewer distinct values than buckets and a lower bound otherwise.
+    """
+    if expected["kind"] != "numeric":
+        return float("nan")
+    expected_shares, actual_shares = _shares(expected), _shares(actual)
+    if expected_shares is None or actual_shares is None:
+        return float("nan")
+    return float(np.max(np.abs(np.cumsum(expected_shares) - np.cumsum(actual_shares))))
+
+
+def quantile(sketch: dict, q: float) -> float:
+    """
+    Estimates a quantile of a numeric column from its sketch, by linear interpolation within the bucket
+    that holds it. The outer buckets are bounded by the minimum and maximum value.
+    """
+    counts = np.asarray(sketch["counts"], dtype=float)
+    if sketch["kind"] != "numeric" or counts.sum() == 0:
+        return float("nan")
+    bounds = [sketch["min"], *sketch["edges"], sketch["max"]]
+    cumulative = np.cumsum(counts) / counts.sum()
+    bucket = int(np.searchsorted(cumulative, q, side="left"))
+    below = cumulative[bucket - 1] if bucket else 0.0
+    low, high = bounds[bucket], max(bounds[bucket], bounds[bucket + 1])
+    return float(low + (high - low) * (q - below) / max(cumulative[bucket] - below, 1e-12))
+
+
+def _count(buckets: dict, data: pd.DataFrame) -> dict:
+    columns = {}
+    for column, bucket in buckets.items():
+        values = data[column]
+        missing = int(values.isna().sum())
+        if bucket["kind"] == "numeric":
+            present = values.dropna().to_numpy(dtype=float)
+            counts = np.bincount(np.searchsorted(bucket["edges"], present, side="right"), minlength=len(bucket["edges"]) + 1)
+            extremes = {"min": float(present.min()) if len(present) else None, "max": float(present.max()) if len(present) else None}
+        else:
+            level_counts = values.value_counts()
+            level_counts.index = level_counts.index.astype(str)
+            counts = level_counts.reindex(bucket["levels"], fill_value=0).to_numpy()
+            # Levels the reference does not have are counted in a last bucket
+            counts = np.append(counts, len(values) - missing - counts.sum())
+            extremes = {}
+        columns[column] = {**bucket, "counts": counts.tolist(), "missing": missing, **extremes}
+    return {"rows": len(data), "columns": columns}
+
+
+def _shares(sketch: dict) -> np.ndarray | None:
+    counts = np.asarray(sketch["counts"], dtype=float)
+    return counts / counts.sum() if counts.sum() else None
+
+
+def _is_numeric(values: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype)
+
+
+def _none_min(left: float | None, right: float | None) -> float | None:
+    return right if left is None else left if right is None else min(left, right)
+
+
+def _none_max(left: float | None, right: float | None) -> float | None:
+    return right if left is None else left if right is None else max(left, right)
@@ -0,0 +1,113 @@
+"""Synthetic student performance factors of any size.
+
+A Gaussian copula is fitted to the raw data: every column keeps its own empirical distribution
+(the observed numeric values, categorical levels and missing-value rate) and the dependencies
+between the columns are kept by the correlations of their normal scores. Sampling draws
+correlated normal vectors and maps every component back through the distribution of its column,
+so any number of rows is generated chunk by chunk in bounded memory.
+"""
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def fit_gaussian_copula(data: pd.DataFrame, levels: dict[str, list] | None = None) -> dict:
+    """
+    Fits the marginal distributions of the columns and the correlation matrix of their normal scores.
+
+    Args:
+        data: The data to imitate, e.g. the raw student performance factors.
+        levels: The ordered levels of categorical columns, e.g. from the `schema` parameters. Other
+            string columns are ordered alphabetically. The order decides which correlations with
+            other columns a categorical column can have.
+
+    Returns:
+        The copula model, only made of lists and numbers, so it can be saved as JSON.
+    """
+    from scipy.special import ndtri
+
+    levels = levels or {}
+    marginals = {}
+    normal_scores = np.empty(data.shape)
+    for position, (column, values) in enumerate(data.items()):
+        if pd.api.types.is_numeric_dtype(values):
+            support = np.sort(values.dropna().unique()).tolist()
+        else:
+            support = levels.get(column) or sorted(values.dropna().unique())
+        if values.isna().any():
+            # Missing values are the lowest level of a column
+            support = [None, *support]
+        codes = pd.Categorical(values, categories=[value for value in support if value is not None]).codes + (support[0] is None)
+        probabilities = np.bincount(codes, minlength=len(support)) / len(values)
+        cdf = np.cumsum(probabilities)
+        marginals[column] = {"values": support, "cdf": cdf.tolist(), "numeric": pd.api.types.is_numeric_dtype(values)}
+        # The normal score of a value is that of the middle of its probability mass
+        normal_scores[:, position] = ndtri(cdf[codes] - probabilities[codes] / 2)
+
+    correlation = np.corrcoef(normal_scores, rowvar=False)
+    return {"columns": list(data.columns), "marginals": marginals, "correlation": _nearest_correlation(correlation).tolist()}
+
+
+def sample_gaussian_copula(model: dict, num_rows: int, random_state: int = 42, chunk_size: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """
+    Samples rows from a fitted copula model.
+
+    Args:
+        model: The copula model from `fit_gaussian_copula`.
+        num_rows: Number of rows to sample.
+        random_state: Seed of the random numbers, the same seed and chunk size give the same rows.
+        chunk_size: Rows per yielded chunk, which bounds the memory use.
+
+    Yields:
+        Chunks of synthetic rows with the columns of the fitted data.
+    """
+    from scipy.special import ndtr
+
+    rng = np.random.default_rng(random_state)
+    cholesky = np.linalg.cholesky(np.asarray(model["correlation"]))
+    for start in range(0, num_rows, chunk_size):
+        size = min(chunk_size, num_rows - start)
+        uniforms = ndtr(rng.standard_normal((size, len(model["columns"]))) @ cholesky.T)
+        chunk = {}
+        for position, column in enumerate(model["columns"]):
+            marginal = model["marginals"][column]
+            codes = np.minimum(np.searchsorted(marginal["cdf"], uniforms[:, position], side="right"), len(marginal["values"]) - 1)
+            if marginal["numeric"]:
+                values = np.array([np.nan if value is None else value for value in marginal["values"]])
+                chunk[column] = values[codes]
+            else:
+                chunk[column] = pd.Categorical.from_codes(
+                    codes - (marginal["values"][0] is None),
+                    categories=[value for value in marginal["values"] if value is not None],
+                )
+        yield pd.DataFrame(chunk).astype({column: "Int64" for column in _integer_columns(model)})
+
+
+def write_synthetic_csv(model: dict, path: str | Path, num_rows: int, random_state: int = 42, chunk_size: int = 1_000_000):
+    """
+    Writes sampled rows to a CSV file in the format of the raw data.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for number, chunk in enumerate(sample_gaussian_copula(model, num_rows, random_state, chunk_size)):
+        chunk.to_csv(path, mode="w" if number == 0 else "a", header=number == 0, index=False)
+
+
+def _integer_columns(model: dict) -> list[str]:
+    return [
+        column for column, marginal in model["marginals"].items()
+        if marginal["numeric"] and all(value is None or float(value).is_integer() for value in marginal["values"])
+    ]
+
+
+def _nearest_correlation(correlation: np.ndarray) -> np.ndarray:
+    """
+    Makes the correlation matrix positive definite, so it has a Cholesky factor. Pairwise
+    correlations of discrete columns can slightly violate that.
+    """
+    eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+    matrix = eigenvectors @ np.diag(np.maximum(eigenvalues, 1e-6)) @ eigenvectors.T
+    scale = np.sqrt(np.diag(matrix))
+    return matrix / np.outer(scale, scale)